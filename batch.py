@@ -0,0 +1,136 @@
+# ==========================================
+# 批量推荐：一次为大量毕业生画像生成 Top-K 岗位 (无需 Streamlit 向导)
+# 用法：python batch.py jobs.csv profiles.jsonl -o results.jsonl --top-k 20 --workers 4
+#
+# profiles.jsonl 每行一个画像，字段同第1/2步的 user_data，另含第3步答案：
+#   {"id": "2024001", "education": "大学本科", "major": "工商管理", "experience": "应届生",
+#    "min_salary": 5000, "preferred_cities": ["广州市"], "district": "天河",
+#    "job_category": "事务/职能类 (行政、人事、助理)", "preferred_industries": ["互联网/计算机/软件"],
+#    "q1": "薪资", "q2": 50}
+# 也可以直接给出 "weights" 覆盖 q1/q2 推导出的权重。
+# ==========================================
+import argparse
+import csv
+import json
+import multiprocessing as mp
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from gdjob import JobRecommender, file_fingerprint, normalize_profile, read_job_table, score_profile
+
+CHUNK_SIZE = 64
+
+# 工作进程内共享的推荐器：fork 模式下直接继承父进程已准备好的数据 (写时复制)，
+# 其他启动方式下由初始化函数从列式缓存加载
+_recommender = None
+
+
+def read_profiles(path):
+    with open(path, encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                profile = normalize_profile(json.loads(line))
+            except ValueError as e:
+                raise ValueError(f"{path} 第 {line_no} 行: {e}") from e
+            profile.setdefault('id', line_no)
+            yield profile
+
+
+def _init_worker(jobs_path, fingerprint):
+    global _recommender
+    if _recommender is None:
+        _recommender = JobRecommender(read_job_table(jobs_path), fingerprint)
+
+
+def _score_chunk(chunk, k):
+    return [score_profile(_recommender, profile, k) for profile in chunk]
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(jobs_path, profiles, k=20, workers=None):
+    # 逐个产出每个画像的结果 (保持输入顺序)；profiles 为 read_profiles 校验过的画像
+    global _recommender
+    fingerprint = file_fingerprint(jobs_path)
+    _recommender = JobRecommender(read_job_table(jobs_path), fingerprint)
+
+    workers = workers or mp.cpu_count()
+    if workers <= 1:
+        for profile in profiles:
+            yield score_profile(_recommender, profile, k)
+        return
+
+    ctx = mp.get_context('fork') if 'fork' in mp.get_all_start_methods() else None
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_init_worker, initargs=(jobs_path, fingerprint)) as pool:
+        chunks = _chunks(profiles, CHUNK_SIZE)
+        for results in pool.map(partial(_score_chunk, k=k), chunks):
+            yield from results
+
+
+def write_results(results, out, fmt):
+    if fmt == 'jsonl':
+        for result in results:
+            out.write(json.dumps(result, ensure_ascii=False) + '\n')
+        return
+    writer = None
+    for result in results:
+        for record in result['results']:
+            row = {'profile_id': result['id'], **record}
+            if writer is None:
+                writer = csv.DictWriter(out, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="批量岗位推荐")
+    parser.add_argument('jobs', help="岗位 CSV 文件")
+    parser.add_argument('profiles', help="画像文件 (JSON Lines)")
+    parser.add_argument('-o', '--output', help="输出文件，缺省写到标准输出")
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl')
+    parser.add_argument('--top-k', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=None, help="工作进程数，缺省为 CPU 核数；1 表示单进程")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    # 先读完并校验整个画像文件：有问题时在加载岗位、写出任何结果之前报错退出
+    try:
+        profiles = list(read_profiles(args.profiles))
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    out = open(args.output, 'w', encoding='utf-8-sig' if args.format == 'csv' else 'utf-8', newline='') \
+        if args.output else sys.stdout
+    count = 0
+    try:
+        def counted(results):
+            nonlocal count
+            for result in results:
+                count += 1
+                yield result
+
+        write_results(counted(run_batch(args.jobs, profiles, args.top_k, args.workers)), out, args.format)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(f"完成 {count} 个画像，用时 {elapsed:.1f}s ({count / max(elapsed, 1e-9):.1f} 个/秒)", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
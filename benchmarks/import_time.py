@@ -0,0 +1,74 @@
+# ==========================================
+# 导入耗时评估：工作进程 / 批处理 / 服务启动时导入评分核心的开销
+# 用法：python -m benchmarks.import_time [--repeat 5] [--budget-ms 50]
+# ==========================================
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# (模块, 说明)；gdjob 本身只加载常量与权重推导，评分核心在首次访问时才导入 pandas/numpy
+TARGETS = [
+    ('gdjob', "包入口 (惰性导出)"),
+    ('gdjob.constants', "常量"),
+    ('gdjob.recommender', "评分核心"),
+    ('gdjob.data', "数据导入"),
+]
+# 评分核心不应拉起的界面依赖
+UI_MODULES = ['streamlit', 'plotly', 'matplotlib']
+
+
+def _import_cumulative_us(module):
+    # 解析 -X importtime 输出中目标模块的累计耗时 (微秒)
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                         check=True, capture_output=True, text=True)
+    for line in out.stderr.splitlines():
+        parts = [p.strip() for p in line.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise RuntimeError(f"importtime 输出中找不到 {module}")
+
+
+def _loaded_ui_modules(module):
+    code = (f"import sys, json, {module}; "
+            f"print(json.dumps([m for m in {UI_MODULES!r} if m in sys.modules]))")
+    out = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True)
+    return json.loads(out.stdout)
+
+
+def measure(repeat):
+    report = []
+    for module, label in TARGETS:
+        samples = [_import_cumulative_us(module) / 1000 for _ in range(repeat)]
+        report.append({'module': module, 'label': label, 'median_ms': round(statistics.median(samples), 1),
+                       'min_ms': round(min(samples), 1), 'ui_modules': _loaded_ui_modules(module)})
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="评分核心导入耗时")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=50, help="`import gdjob` 的耗时上限 (中位数)")
+    parser.add_argument('--json', action='store_true', help="以 JSON 输出")
+    args = parser.parse_args()
+
+    report = measure(args.repeat)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        for r in report:
+            ui = ','.join(r['ui_modules']) or '-'
+            print(f"{r['module']:<20} {r['median_ms']:>8.1f} ms (min {r['min_ms']:.1f})  界面依赖: {ui}  {r['label']}")
+
+    failures = [f"{r['module']} 导入了界面依赖 {r['ui_modules']}" for r in report if r['ui_modules']]
+    entry = next(r for r in report if r['module'] == 'gdjob')
+    if entry['median_ms'] > args.budget_ms:
+        failures.append(f"import gdjob 用时 {entry['median_ms']:.1f} ms，超过 {args.budget_ms:.0f} ms")
+    for f in failures:
+        print(f, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
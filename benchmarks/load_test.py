@@ -0,0 +1,136 @@
+# ==========================================
+# 推荐服务压测：多个长连接并发请求 POST /recommend，报告 p50/p95/p99 延迟与吞吐 (仅依赖标准库)
+# 用法：python serve.py jobs.csv --port 8765            # 先启动服务
+#       python -m benchmarks.load_test --port 8765 --concurrency 32 --requests 2000 [--distinct 50] [-o load.json]
+#
+# --distinct：请求在多少个不同画像之间轮换 (越小越能体现相同请求的合并)
+# ==========================================
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+
+from benchmarks.synthetic import SAMPLE_PROFILE
+from gdjob.constants import GUANGDONG_CITIES, INDUSTRY_LIST, JOB_CATEGORY_KEYWORDS
+
+
+def make_profiles(n, seed=0):
+    # 在示例画像基础上随机变换城市 / 职能 / 行业 / 期望薪资，得到 n 个不同画像
+    rng = random.Random(seed)
+    profiles = []
+    for i in range(n):
+        profiles.append({
+            **SAMPLE_PROFILE,
+            'id': i,
+            'preferred_cities': rng.sample(GUANGDONG_CITIES, 2),
+            'job_category': rng.choice(list(JOB_CATEGORY_KEYWORDS)),
+            'preferred_industries': rng.sample(INDUSTRY_LIST, 2),
+            'min_salary': rng.choice([4000, 5000, 6000, 8000, 10000]),
+            'q1': rng.choice(['薪资', '成长', '稳定']),
+            'q2': rng.randint(0, 100),
+        })
+    return profiles
+
+
+async def _request(reader, writer, host, body):
+    writer.write((f"POST /recommend HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode('latin-1') + body)
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ', 2)[1])
+    length = 0
+    for line in lines[1:]:
+        if line.lower().startswith('content-length:'):
+            length = int(line.split(':', 1)[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def _client(host, port, queue, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            try:
+                body = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            try:
+                status = await _request(reader, writer, host, body)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                errors['connection'] = errors.get('connection', 0) + 1
+                writer.close()
+                reader, writer = await asyncio.open_connection(host, port)
+                continue
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors[status] = errors.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+def _percentile(values, q):
+    return statistics.quantiles(values, n=100, method='inclusive')[q - 1] if len(values) > 1 else values[0]
+
+
+async def run(host, port, concurrency, n_requests, distinct, top_k, seed):
+    profiles = make_profiles(distinct, seed)
+    rng = random.Random(seed)
+    queue = asyncio.Queue()
+    for _ in range(n_requests):
+        queue.put_nowait(json.dumps({**rng.choice(profiles), 'top_k': top_k}, ensure_ascii=False).encode('utf-8'))
+    latencies, errors = [], {}
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, queue, latencies, errors) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    ms = [v * 1000 for v in latencies]
+    return {
+        'requests': n_requests,
+        'ok': len(latencies),
+        'errors': {str(k): v for k, v in errors.items()},
+        'concurrency': concurrency,
+        'distinct_profiles': distinct,
+        'top_k': top_k,
+        'elapsed_s': round(elapsed, 3),
+        'rps': round(len(latencies) / elapsed, 1),
+        'latency_ms': {
+            'p50': round(_percentile(ms, 50), 2),
+            'p95': round(_percentile(ms, 95), 2),
+            'p99': round(_percentile(ms, 99), 2),
+            'max': round(max(ms), 2),
+            'mean': round(statistics.fmean(ms), 2),
+        } if ms else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="推荐服务压测")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--concurrency', type=int, default=16, help="并发连接数")
+    parser.add_argument('--requests', type=int, default=1000, help="请求总数")
+    parser.add_argument('--distinct', type=int, default=100, help="不同画像的个数")
+    parser.add_argument('--top-k', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help="JSON 报告路径")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args.host, args.port, args.concurrency, args.requests, args.distinct, args.top_k,
+                             args.seed))
+    latency = report['latency_ms'] or {}
+    print(f"成功 {report['ok']}/{report['requests']}  {report['rps']} 次/秒  "
+          f"p50 {latency.get('p50')}ms  p95 {latency.get('p95')}ms  p99 {latency.get('p99')}ms  "
+          f"错误 {report['errors'] or '无'}", file=sys.stderr)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0 if report['ok'] == report['requests'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
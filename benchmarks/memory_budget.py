@@ -0,0 +1,111 @@
+# ==========================================
+# 内存预算评估：合成数据集上跑一遍 导入 → 建索引 → 推荐，报告各阶段峰值 RSS
+# 用法：python -m benchmarks.memory_budget --rows 500000 [--budget-mb 1500] [--stream]
+#       --stream 评估流式推荐 (分块读取，峰值内存应与行数无关)
+# ==========================================
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+from gdjob.profiling import _proc_status_mb
+
+
+def _peak_rss_mb():
+    # 优先读 VmHWM (exec 后重新计数)；ru_maxrss 会继承父进程的峰值，仅作兜底 (Linux 下单位为 KB)
+    peak = _proc_status_mb('VmHWM')
+    return peak if peak is not None else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _current_rss_mb():
+    rss = _proc_status_mb('VmRSS')
+    return rss if rss is not None else float('nan')
+
+
+def measure(csv_path, cache_dir):
+    # 在独立子进程中执行，避免生成数据的内存计入峰值
+    stages = []
+
+    def record(name, **extra):
+        stages.append({'stage': name, 'peak_rss_mb': round(_peak_rss_mb(), 1),
+                       'rss_mb': round(_current_rss_mb(), 1), **extra})
+
+    record('start')
+    from gdjob import JobRecommender, read_job_table
+    from benchmarks.synthetic import SAMPLE_PROFILE, SAMPLE_WEIGHTS
+    record('import')
+
+    df = read_job_table(csv_path, cache_dir)
+    record('load', rows=len(df), frame_mb=round(df.memory_usage(deep=True).sum() / 1024 ** 2, 1))
+
+    recommender = JobRecommender(df)
+    del df
+    record('prepare', frame_mb=round(recommender.df.memory_usage(deep=True).sum() / 1024 ** 2, 1),
+           features_mb=round(recommender.features.nbytes() / 1024 ** 2, 1))
+
+    top_jobs = recommender.recommend(SAMPLE_PROFILE, SAMPLE_WEIGHTS)
+    record('recommend', rows=len(top_jobs))
+    return stages
+
+
+def measure_stream(csv_path):
+    stages = []
+
+    def record(name, **extra):
+        stages.append({'stage': name, 'peak_rss_mb': round(_peak_rss_mb(), 1),
+                       'rss_mb': round(_current_rss_mb(), 1), **extra})
+
+    record('start')
+    from gdjob.streaming import stream_recommend
+    from benchmarks.synthetic import SAMPLE_PROFILE, SAMPLE_WEIGHTS
+    record('import')
+
+    result = stream_recommend(csv_path, SAMPLE_PROFILE, SAMPLE_WEIGHTS)
+    record('stream', rows=result['n_rows'], selected=result['n_selected'], kept=len(result['top_jobs']))
+    return stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="岗位推荐内存预算评估")
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--budget-mb', type=float, default=None, help="峰值 RSS 上限，超出时返回非零退出码")
+    parser.add_argument('--stream', action='store_true', help="评估流式推荐模式")
+    parser.add_argument('--measure', metavar='CSV', help=argparse.SUPPRESS)
+    parser.add_argument('--cache-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        stages = measure_stream(args.measure) if args.stream else measure(args.measure, args.cache_dir)
+        print(json.dumps(stages, ensure_ascii=False))
+        return 0
+
+    from benchmarks.synthetic import generate_jobs
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'jobs.csv')
+        generate_jobs(args.rows, seed=args.seed).to_csv(csv_path, index=False)
+        out = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.memory_budget', '--measure', csv_path,
+             '--cache-dir', os.path.join(tmp, 'cache')] + (['--stream'] if args.stream else []),
+            check=True, capture_output=True, text=True
+        )
+    stages = json.loads(out.stdout.strip().splitlines()[-1])
+
+    print(f"rows={args.rows}")
+    for s in stages:
+        extra = ' '.join(f"{k}={v}" for k, v in s.items() if k not in ('stage', 'peak_rss_mb', 'rss_mb'))
+        print(f"{s['stage']:<10} peak_rss={s['peak_rss_mb']:>8.1f} MB  rss={s['rss_mb']:>8.1f} MB  {extra}")
+
+    peak = max(s['peak_rss_mb'] for s in stages)
+    if args.budget_mb is not None and peak > args.budget_mb:
+        print(f"超出内存预算: {peak:.1f} MB > {args.budget_mb:.1f} MB")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
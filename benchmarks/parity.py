@@ -0,0 +1,107 @@
+# ==========================================
+# 一致性校验：列式评分引擎与逐行 apply 的旧实现在合成数据上逐位对比 (含边界画像与缺失列)
+# 用法：python -m benchmarks.parity [--rows 5000] [--seed 0]
+#
+# 对比项：calculate_scores(vectorized=True) 与 vectorized=False 的行顺序、七维得分、综合得分、推荐理由；
+#        recommend() 与旧实现按 "高分全部入选，否则取前 N 名" 截取后的结果
+# 有任何不一致时打印差异并返回非零退出码
+# ==========================================
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import SAMPLE_PROFILE, SAMPLE_WEIGHTS, generate_jobs
+from gdjob import FALLBACK_TOP_N, HIGH_SCORE_THRESHOLD, INDUSTRY_LIST, JobRecommender, derive_weights
+
+SCORE_COLUMNS = ['学历数值', 'S_学历', 'S_经验', 'S_专业', 'S_薪资', 'S_城市', 'S_稳定', 'S_潜力', '综合得分']
+
+# (名称, 画像)；在示例画像基础上逐项改成边界取值
+EDGE_PROFILES = [
+    ('sample', SAMPLE_PROFILE),
+    ('empty_major', {**SAMPLE_PROFILE, 'major': ''}),
+    ('no_cities', {**SAMPLE_PROFILE, 'preferred_cities': [], 'district': ''}),
+    ('empty_industry', {**SAMPLE_PROFILE, 'preferred_industries': ['']}),
+    ('no_industries', {**SAMPLE_PROFILE, 'preferred_industries': []}),
+    ('unknown_category', {**SAMPLE_PROFILE, 'job_category': '不存在的职能'}),
+    ('experienced', {**SAMPLE_PROFILE, 'experience': '3-5年', 'education': '博士', 'min_salary': 12000}),
+    ('low_education', {**SAMPLE_PROFILE, 'education': '中专/高中', 'district': '南山'}),
+    ('all_industries', {**SAMPLE_PROFILE, 'preferred_industries': INDUSTRY_LIST,
+                        'preferred_cities': ['珠海市', '东莞市', '深圳市']}),
+]
+WEIGHT_SETS = [
+    ('sample', SAMPLE_WEIGHTS),
+    ('salary', derive_weights('薪资', 80)),
+    ('stable', derive_weights('稳定', 0)),
+]
+
+
+def make_datasets(n_rows, seed):
+    # (名称, 岗位表)：完整数据、全为缺失值的文本列、缺少可选列
+    jobs = generate_jobs(n_rows, seed=seed)
+    blank = jobs.copy()
+    for col in ['行业', '单位性质', '经验要求']:
+        blank[col] = np.nan
+    missing = jobs.drop(columns=['单位性质', '经验要求', '学历要求'])
+    return [('full', jobs), ('nan_columns', blank), ('missing_columns', missing)]
+
+
+def _compare(expected, actual, columns):
+    # 返回差异描述列表 (空表示一致)；数值按 float64 逐位比较，文本按原值比较
+    problems = []
+    if not expected.index.equals(actual.index):
+        problems.append(f"行顺序不同 ({len(expected)} vs {len(actual)} 行)")
+        return problems
+    for col in columns:
+        if col not in expected.columns or col not in actual.columns:
+            problems.append(f"缺少列 {col}")
+            continue
+        a, b = expected[col].to_numpy(), actual[col].to_numpy()
+        if pd.api.types.is_numeric_dtype(expected[col]):
+            same = np.array_equal(a.astype(np.float64), b.astype(np.float64), equal_nan=True)
+        else:
+            same = (pd.Series(a, dtype=object).fillna('') == pd.Series(b, dtype=object).fillna('')).all()
+        if not same:
+            problems.append(f"列 {col} 不一致")
+    return problems
+
+
+def _legacy_selection(legacy, threshold=HIGH_SCORE_THRESHOLD, fallback_k=FALLBACK_TOP_N):
+    high = legacy[legacy['综合得分'] >= threshold]
+    return high if len(high) else legacy.head(fallback_k)
+
+
+def check(recommender, profile, weights):
+    legacy = recommender.calculate_scores(profile, weights, vectorized=False)
+    vectorized = recommender.calculate_scores(profile, weights)
+    columns = list(legacy.columns)
+    problems = [] if columns == list(vectorized.columns) else ["calculate_scores 两条路径的列不同"]
+    problems += _compare(legacy, vectorized, columns)
+    problems += [f"recommend: {p}" for p in _compare(_legacy_selection(legacy),
+                                                     recommender.recommend(profile, weights), columns)]
+    return problems, len(legacy)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="评分引擎一致性校验")
+    parser.add_argument('--rows', type=int, default=5_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for data_name, jobs in make_datasets(args.rows, args.seed):
+        recommender = JobRecommender(jobs)
+        for profile_name, profile in EDGE_PROFILES:
+            for weight_name, weights in WEIGHT_SETS:
+                problems, n_rows = check(recommender, profile, weights)
+                status = "OK  " if not problems else "FAIL"
+                print(f"{status} {data_name:<16} {profile_name:<17} {weight_name:<7} {n_rows:>6} 行"
+                      + (f"  {'; '.join(problems)}" if problems else ''))
+                failures += bool(problems)
+    print(f"{'全部一致' if not failures else f'{failures} 组不一致'}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,219 @@
+# ==========================================
+# 性能基准：在合成广东省岗位数据上逐阶段计时，结果写入 JSON 报告
+# 用法：python -m benchmarks.run [--sizes 10000 60000 500000 2000000] [-o bench_report.json]
+#       python -m benchmarks.run --baseline old_report.json   # 与旧报告对比，有回退时返回非零退出码
+#
+# 阶段：load_cold (解析 CSV + 写列式缓存) / load_warm (内存映射缓存) / init (JobRecommender.__init__，
+#      含特征索引) / features (仅特征索引) / filter (学历过滤) / S_* (各评分维度) / weighted_total /
+#      rank / recommend (端到端，不走缓存) / aggregate (第4步驾驶舱统计)
+# 并行：--workers 2 4 时另测多进程评分 (过滤 + 七维 + 加权 + Top-K 合并)，报告相对串行的加速比并校验结果一致
+# ==========================================
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import SAMPLE_PROFILE, SAMPLE_WEIGHTS, generate_jobs
+from gdjob import EDU_MAP, JobFeatureIndex, JobRecommender, ParallelScorer, file_fingerprint, rank_top_jobs, \
+    read_job_table, summarize_jobs, weighted_total
+
+DEFAULT_SIZES = [10_000, 60_000, 500_000, 2_000_000]
+# 低于该耗时的差异视为噪声，不判定为回退
+NOISE_FLOOR_S = 0.005
+
+
+def _timed(fn, repeat):
+    # 返回 (计时统计, 最后一次的结果)
+    times = []
+    result = None
+    for i in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn(i)
+        times.append(time.perf_counter() - start)
+    return {'median_s': round(statistics.median(times), 6), 'min_s': round(min(times), 6)}, result
+
+
+def bench_parallel(features, profile, weights, workers, repeat):
+    # 串行基准与并行路径计算同一件事：全表学历过滤 + 七维得分 + 加权 + 选出入选行
+    user_edu_val = EDU_MAP.get(profile['education'], 3)
+
+    def serial(i):
+        rows = features.eligible_rows(user_edu_val)
+        total = weighted_total(features.score_dimensions(rows, profile, user_edu_val), weights)
+        picked = rank_top_jobs(total)
+        return rows[picked], total[picked]
+
+    serial_timing, (rows, total) = _timed(serial, repeat)
+    results = {'serial': serial_timing, 'workers': {}}
+    for n in workers:
+        scorer = ParallelScorer(features, n)
+        try:
+            scorer.top(profile, weights)  # 预热：启动进程池并映射共享内存
+            timing, (p_rows, p_total) = _timed(lambda i: scorer.top(profile, weights), repeat)
+        finally:
+            scorer.close()
+        timing['speedup'] = round(serial_timing['median_s'] / max(timing['median_s'], 1e-9), 2)
+        timing['identical'] = bool(np.array_equal(rows, p_rows) and np.array_equal(total, p_total))
+        results['workers'][str(n)] = timing
+    return results
+
+
+def bench_size(n_rows, repeat, seed, workdir, workers=()):
+    stages = {}
+    csv_path = os.path.join(workdir, f'jobs_{n_rows}.csv')
+    generate_jobs(n_rows, seed=seed).to_csv(csv_path, index=False)
+    fingerprint = file_fingerprint(csv_path)
+
+    # 导入：每次使用新的缓存目录，保证冷启动
+    stages['load_cold'], df = _timed(
+        lambda i: read_job_table(csv_path, os.path.join(workdir, f'cache_{n_rows}_{i}')), repeat)
+    stages['load_warm'], df = _timed(lambda i: read_job_table(csv_path, os.path.join(workdir, f'cache_{n_rows}_0')),
+                                     repeat)
+
+    # 构造推荐器 (清洗 + 特征索引)；直接构造，不经过进程级推荐器缓存
+    stages['init'], recommender = _timed(lambda i, df=df: JobRecommender(df, fingerprint), repeat)
+    del df
+    stages['features'], features = _timed(lambda i: JobFeatureIndex(recommender.df), repeat)
+
+    profile, weights = SAMPLE_PROFILE, SAMPLE_WEIGHTS
+    user_edu_val = EDU_MAP.get(profile['education'], 3)
+    stages['filter'], rows = _timed(lambda i: features.eligible_rows(user_edu_val), repeat)
+    dims = {}
+    for col in JobFeatureIndex.DIMENSION_SCORERS:
+        stages[col], dims[col] = _timed(
+            lambda i, col=col: features.score_dimension(col, rows, profile, user_edu_val), repeat)
+    stages['weighted_total'], total = _timed(lambda i: weighted_total(dims, weights), repeat)
+    stages['rank'], picked = _timed(lambda i: rank_top_jobs(total), repeat)
+
+    def recommend_uncached(i):
+        recommender._results.clear()
+        recommender._dimensions.clear()
+        return recommender.recommend(profile, weights)
+
+    stages['recommend'], top_jobs = _timed(recommend_uncached, repeat)
+    stages['aggregate'], _ = _timed(
+        lambda i: summarize_jobs(top_jobs.copy(), profile['preferred_cities']), repeat)
+
+    result = {
+        'rows': n_rows,
+        'csv_mb': round(os.path.getsize(csv_path) / 1024 ** 2, 1),
+        'eligible_rows': int(len(rows)),
+        'selected_rows': int(len(picked)),
+        'stages': stages,
+    }
+    if workers:
+        result['parallel'] = bench_parallel(features, profile, weights, workers, repeat)
+    return result
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment():
+    try:
+        import pyarrow
+        pyarrow_version = pyarrow.__version__
+    except ImportError:
+        pyarrow_version = None
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'pyarrow': pyarrow_version,
+    }
+
+
+def find_regressions(report, baseline, tolerance):
+    # 同一数据规模、同一阶段的中位耗时超过基线 (1 + tolerance) 倍即视为回退
+    old = {r['rows']: r['stages'] for r in baseline.get('results', [])}
+    regressions = []
+    for result in report['results']:
+        for stage, timing in result['stages'].items():
+            before = old.get(result['rows'], {}).get(stage)
+            if before is None:
+                continue
+            now, then = timing['median_s'], before['median_s']
+            if now > then * (1 + tolerance) and now - then > NOISE_FLOOR_S:
+                regressions.append({'rows': result['rows'], 'stage': stage, 'baseline_s': then, 'current_s': now,
+                                    'ratio': round(now / max(then, 1e-9), 2)})
+    return regressions
+
+
+def print_table(report, out=sys.stderr):
+    results = report['results']
+    stages = list(results[0]['stages']) if results else []
+    print(f"{'阶段':<16}" + ''.join(f"{r['rows']:>12,}" for r in results), file=out)
+    for stage in stages:
+        cells = ''.join(f"{r['stages'][stage]['median_s'] * 1000:>10.1f}ms" for r in results)
+        print(f"{stage:<16}{cells}", file=out)
+    for r in results:
+        parallel = r.get('parallel')
+        if not parallel:
+            continue
+        cells = ', '.join(f"{n} 进程 {t['median_s'] * 1000:.1f}ms x{t['speedup']}{'' if t['identical'] else ' (结果不一致!)'}"
+                          for n, t in parallel['workers'].items())
+        print(f"并行 {r['rows']:,} 行：串行 {parallel['serial']['median_s'] * 1000:.1f}ms；{cells}", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="岗位推荐性能基准")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="数据规模 (行数)")
+    parser.add_argument('--repeat', type=int, default=3, help="每个阶段重复次数，报告中位数与最小值")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', default='bench_report.json', help="JSON 报告路径")
+    parser.add_argument('--baseline', help="用于对比的旧报告")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="允许的相对变慢比例")
+    parser.add_argument('--workers', type=int, nargs='*', default=[], help="另测多进程评分的进程数，如 2 4 8")
+    args = parser.parse_args(argv)
+
+    report = {'environment': environment(), 'seed': args.seed, 'repeat': args.repeat,
+              'profile': SAMPLE_PROFILE, 'weights': SAMPLE_WEIGHTS, 'results': []}
+    with tempfile.TemporaryDirectory() as workdir:
+        for n_rows in args.sizes:
+            print(f"压测 {n_rows:,} 行 ...", file=sys.stderr)
+            report['results'].append(bench_size(n_rows, args.repeat, args.seed, workdir, args.workers))
+            # 每个规模结束后就写一次报告，大规模中途失败也能保留已完成的结果
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print_table(report)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = find_regressions(report, json.load(f), args.tolerance)
+        report['regressions'] = regressions
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        for r in regressions:
+            print(f"回退：{r['rows']:,} 行 {r['stage']} {r['baseline_s'] * 1000:.1f}ms → "
+                  f"{r['current_s'] * 1000:.1f}ms (x{r['ratio']})", file=sys.stderr)
+        if regressions:
+            return 1
+    if any(not t['identical'] for r in report['results'] for t in r.get('parallel', {}).get('workers', {}).values()):
+        print("并行评分结果与串行不一致", file=sys.stderr)
+        return 1
+    print(f"报告已写入 {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+# ==========================================
+# 合成广东省岗位数据 (字段与上传 CSV 一致)，用于压测与内存评估
+# ==========================================
+import numpy as np
+import pandas as pd
+
+from gdjob.constants import GUANGDONG_CITIES, INDUSTRY_LIST, JOB_CATEGORY_KEYWORDS
+
+CITY_DISTRICTS = {
+    "广州市": ["天河区", "越秀区", "海珠区", "番禺区", "白云区", "黄埔区"],
+    "深圳市": ["南山区", "福田区", "罗湖区", "宝安区", "龙岗区", "龙华区"],
+    "珠海市": ["香洲区", "斗门区", "金湾区"],
+    "佛山市": ["禅城区", "南海区", "顺德区"],
+    "东莞市": ["南城街道", "松山湖", "长安镇"],
+}
+TITLE_PREFIXES = ["", "", "高级", "初级", "资深", "储备", "管培生-"]
+TITLE_SUFFIXES = ["", "", "专员", "助理", "主管", "(应届可投)", "实习生"]
+UNIT_BRANDS = ["华南", "粤海", "鹏程", "珠江", "南方", "岭南", "星河", "东方", "创新", "远航"]
+UNIT_TYPES = ["科技有限公司", "贸易有限公司", "电子厂", "银行分行", "医院", "学校", "集团(国企)", "事业单位", "咨询有限公司"]
+UNIT_NATURE = ["民营", "民营", "民营", "国企", "外资", "合资", "事业单位", "机关", "上市公司", np.nan]
+UNIT_SIZE = ["20人以下", "20-99人", "100-499人", "500-999人", "1000人以上", np.nan]
+EDU_REQS = ["不限", "中专/高中", "大学专科", "大学专科", "大学本科", "大学本科", "本科/硕士", "硕士研究生", "博士", np.nan]
+EXP_REQS = ["无经验", "不限", "应届毕业生", "1-3年", "3-5年", "5-10年", np.nan]
+EMPLOY_TYPE = ["全职", "全职", "全职", "兼职", "实习"]
+LODGING = ["包吃住", "包住", "不包", np.nan]
+SOURCES = ["招聘会", "网络招聘", "公共就业服务"]
+
+
+def _pick(rng, values, n):
+    return np.asarray(values, dtype=object)[rng.integers(0, len(values), n)]
+
+
+def generate_jobs(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+
+    # 职位名称：职能关键词 + 前后缀组合成词表后抽样，保证重复率接近真实数据
+    keywords = [kw for kws in JOB_CATEGORY_KEYWORDS.values() for kw in kws] + ["普工", "操作工", "质检员", "仓管"]
+    titles = [f"{p}{kw}{s}" for kw in keywords for p in TITLE_PREFIXES for s in TITLE_SUFFIXES]
+
+    # 工作地区：部分只写城市，部分带区县
+    areas = []
+    for city in GUANGDONG_CITIES:
+        areas.append(f"广东省{city}")
+        areas.extend(f"广东省{city}{d}" for d in CITY_DISTRICTS.get(city, []))
+
+    units = [f"{city[:2]}{brand}{kind}" for city in GUANGDONG_CITIES for brand in UNIT_BRANDS for kind in UNIT_TYPES]
+
+    # 薪资：按 500 元取整的对数正态分布，约 5% 面议
+    low = np.round(rng.lognormal(np.log(5500), 0.4, n_rows) / 500) * 500
+    high = low * rng.choice([1.2, 1.5, 1.6, 2.0], n_rows)
+    negotiable = rng.random(n_rows) < 0.05
+    low[negotiable] = np.nan
+    high[negotiable] = np.nan
+    salary_text = np.where(negotiable, "面议",
+                           pd.Series(low / 1000).round(1).astype(str) + "-" + pd.Series(high / 1000).round(1).astype(str) + "k")
+
+    publish = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, n_rows), unit="D")
+
+    return pd.DataFrame({
+        '职位名称': _pick(rng, titles, n_rows),
+        '单位名称': _pick(rng, units, n_rows),
+        '薪资文本': salary_text,
+        '工作地区': _pick(rng, areas, n_rows),
+        '学历要求': _pick(rng, EDU_REQS, n_rows),
+        '经验要求': _pick(rng, EXP_REQS, n_rows),
+        '行业': _pick(rng, INDUSTRY_LIST + [np.nan], n_rows),
+        '单位性质': _pick(rng, UNIT_NATURE, n_rows),
+        '单位规模': _pick(rng, UNIT_SIZE, n_rows),
+        '用工性质': _pick(rng, EMPLOY_TYPE, n_rows),
+        '薪资下限': low,
+        '薪资上限': high,
+        '住宿情况': _pick(rng, LODGING, n_rows),
+        '发布时间': publish.strftime("%Y-%m-%d"),
+        '来源类型': _pick(rng, SOURCES, n_rows),
+        '职位来源': _pick(rng, ["广东省人社厅", "市级就业平台", "高校就业网"], n_rows),
+        '岗位ID': np.arange(1, n_rows + 1, dtype=np.int64) + 10_000_000,
+    })
+
+
+# 默认画像与权重 (对应第3步未做调整时的选择)
+SAMPLE_PROFILE = {
+    'education': '大学本科', 'major': '工商管理', 'experience': '应届生', 'min_salary': 5000,
+    'preferred_cities': ['广州市', '深圳市', '佛山市'], 'district': '天河',
+    'job_category': list(JOB_CATEGORY_KEYWORDS)[0], 'preferred_industries': ['互联网/计算机/软件'],
+}
+SAMPLE_WEIGHTS = {'学历': 10, '经验': 10, '专业': 17, '薪资': 40, '城市': 15, '潜力': 10, '稳定': 0}
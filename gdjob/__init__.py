@@ -0,0 +1,62 @@
+# ==========================================
+# 广东省岗位智能推荐 —— 评分核心 (可脱离 Streamlit 独立导入)
+# 常量与权重推导为纯 Python；pandas/numpy/pyarrow 等重依赖在首次访问对应对象时才导入
+# ==========================================
+import importlib
+
+from .constants import (
+    EDU_MAP, FALLBACK_TOP_N, GROWTH_KEYWORDS, GUANGDONG_CITIES, HIGH_SCORE_THRESHOLD, INDUSTRY_LIST,
+    JOB_CATEGORY_KEYWORDS, PIPELINE_STAGES, SCORE_DIMENSIONS, STABLE_KEYWORDS,
+)
+from .weights import derive_weights
+
+_LAZY_EXPORTS = {
+    'LRUCache': 'cache',
+    'JobRecommender': 'recommender',
+    'JobFeatureIndex': 'recommender',
+    'build_reasons': 'recommender',
+    'clean_job_table': 'recommender',
+    'compact_job_table': 'recommender',
+    'dataset_fingerprint': 'recommender',
+    'get_recommender': 'recommender',
+    'rank_top_jobs': 'recommender',
+    'request_key': 'recommender',
+    'weighted_total': 'recommender',
+    'file_fingerprint': 'data',
+    'prepare_job_table': 'data',
+    'read_job_table': 'data',
+    'prefetch': 'pipeline',
+    'prepare_recommender': 'pipeline',
+    'smart_location_name': 'dashboard',
+    'annotate_jobs': 'dashboard',
+    'summarize_jobs': 'dashboard',
+    'StatsCube': 'dashboard',
+    'stream_recommend': 'streaming',
+    'StageProfiler': 'profiling',
+    'NgramIndex': 'text_index',
+    'export_path': 'export',
+    'query_results': 'result_table',
+    'ParallelScorer': 'parallel',
+    'PROFILE_DEFAULTS': 'profiles',
+    'normalize_profile': 'profiles',
+    'score_profile': 'profiles',
+}
+
+__all__ = [
+    'EDU_MAP', 'FALLBACK_TOP_N', 'GROWTH_KEYWORDS', 'GUANGDONG_CITIES', 'HIGH_SCORE_THRESHOLD', 'INDUSTRY_LIST',
+    'JOB_CATEGORY_KEYWORDS', 'PIPELINE_STAGES', 'SCORE_DIMENSIONS', 'STABLE_KEYWORDS', 'derive_weights',
+    *_LAZY_EXPORTS,
+]
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
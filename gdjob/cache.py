@@ -0,0 +1,101 @@
+# ==========================================
+# 进程级缓存
+# ==========================================
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    # 线程安全的进程级 LRU 缓存：按条目数和估算内存 (字节) 双重上限淘汰最久未用的条目
+    # on_change(cache) 在条目增删后 (锁外) 调用，供外层缓存重新计算包含本缓存的条目大小
+    def __init__(self, max_entries=None, max_bytes=None, sizeof=None, on_change=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof or (lambda value: 0)
+        self._on_change = on_change
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._building = {}
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        size = self._sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self.total_bytes -= self._sizes.pop(key)
+                del self._data[key]
+            self._data[key] = value
+            self._sizes[key] = size
+            self.total_bytes += size
+            self._evict()
+        self._changed()
+
+    def resize(self, key):
+        # 条目在缓存之外变大/变小时 (如其内部缓存增长) 重新估算其大小，必要时淘汰其他条目
+        with self._lock:
+            if key not in self._data:
+                return
+            size = self._sizeof(self._data[key])
+            self.total_bytes += size - self._sizes[key]
+            self._sizes[key] = size
+            self._evict()
+        self._changed()
+
+    def trim(self, max_bytes):
+        # 临时收紧内存上限：淘汰最久未用的条目直到不超过 max_bytes (仍至少保留最新的一项)
+        with self._lock:
+            self._evict(max_bytes)
+
+    def _changed(self):
+        if self._on_change is not None:
+            self._on_change(self)
+
+    def get_or_create(self, key, factory):
+        # 同一个键只构建一次：并发请求等待首个构建者完成
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._lock:
+            key_lock = self._building.setdefault(key, threading.Lock())
+        with key_lock:
+            value = self.get(key, _MISSING)
+            if value is _MISSING:
+                value = factory()
+                self.put(key, value)
+        with self._lock:
+            self._building.pop(key, None)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.total_bytes = 0
+        self._changed()
+
+    def _evict(self, max_bytes=None):
+        # 至少保留最新的一项，即便它本身超过内存上限
+        if max_bytes is None or (self.max_bytes is not None and self.max_bytes < max_bytes):
+            max_bytes = self.max_bytes
+        while len(self._data) > 1 and (
+                (self.max_entries is not None and len(self._data) > self.max_entries) or
+                (max_bytes is not None and self.total_bytes > max_bytes)):
+            key, _ = self._data.popitem(last=False)
+            self.total_bytes -= self._sizes.pop(key)
+
@@ -0,0 +1,66 @@
+# ==========================================
+# 常量：职能/行业/城市选项与评分规则 (纯数据，导入无额外依赖)
+# ==========================================
+
+# 预定义的分类关键词映射库
+JOB_CATEGORY_KEYWORDS = {
+    "事务/职能类 (行政、人事、助理)": ["行政", "人事", "HR", "助理", "文员", "秘书", "前台", "专员", "后勤", "档案"],
+    "沟通/销售类 (销售、咨询、客服)": ["销售", "顾问", "业务", "客服", "客户", "经理", "招商", "代表", "置业", "经纪人"],
+    "技术/研发类 (开发、运维、工程)": ["工程师", "开发", "运维", "数据", "算法", "IT", "测试", "架构", "前端", "后端"],
+    "设计/创意类 (UI、设计、媒体)": ["设计", "UI", "美工", "剪辑", "策划", "文案", "新媒体", "视频", "创意"],
+    "财务/金融类 (会计、审计、风控)": ["会计", "财务", "审计", "出纳", "结算", "风控", "投资", "分析师"],
+    "运营/管理类 (运营、项目、管培)": ["运营", "项目", "管培生", "储备", "主管", "店长", "调度"],
+    "教育/服务类 (教师、培训、服务)": ["教师", "培训", "教务", "服务员", "司机", "保安", "厨师"]
+}
+
+# 常见行业列表
+INDUSTRY_LIST = [
+    "互联网/计算机/软件", "金融/银行/保险", "教育/培训/院校", "房地产/建筑/建材",
+    "批发/零售/贸易", "制造业/机械/电子", "医疗/卫生/制药", "物流/运输/仓储",
+    "广告/传媒/文化", "政府/公共事业/非盈利", "服务业 (餐饮/酒店/旅游)"
+]
+
+# 广东省主要城市列表
+GUANGDONG_CITIES = [
+    "广州市", "深圳市", "珠海市", "佛山市", "东莞市", "惠州市", "中山市",
+    "江门市", "肇庆市", "汕头市", "湛江市", "茂名市", "清远市", "韶关市"
+]
+
+# 学历等级映射 (数值越大要求越高)
+EDU_MAP = {
+    '博士': 6,
+    '硕士研究生': 5, '硕士': 5,
+    '大学本科': 4, '本科': 4,
+    '大学专科': 3, '专科': 3,
+    '中专': 2, '高中': 2, '中技': 2,
+    '初中': 1, '不限': 0, '': 0
+}
+
+# 稳定性 / 发展潜力关键词
+STABLE_KEYWORDS = ['国企', '央企', '事业单位', '机关', '学校', '医院', '银行', '分行', '政府', '公办']
+GROWTH_KEYWORDS = ['管培', '储备', '晋升', '培训', '核心', '梯队', '主管']
+
+# 第4步筛选规则：综合得分达到阈值的全部入选，若一个都没有则取前 N 名
+HIGH_SCORE_THRESHOLD = 80
+FALLBACK_TOP_N = 20
+
+# 岗位表的紧凑表示：这些列固定转分类；其余文本列去重率低于阈值时也转分类
+CATEGORICAL_COLS = ['行业', '工作地区', '单位性质', '学历要求', '经验要求']
+CATEGORY_MAX_RATIO = 0.5
+SALARY_COLS = ['薪资下限', '薪资上限']
+
+# 评分维度 (得分列, 权重键)，顺序即综合得分的累加顺序
+SCORE_DIMENSIONS = [
+    ('S_学历', '学历'), ('S_经验', '经验'), ('S_专业', '专业'), ('S_薪资', '薪资'),
+    ('S_城市', '城市'), ('S_潜力', '潜力'), ('S_稳定', '稳定')
+]
+
+# 推荐流水线阶段：阶段名 → (进入该阶段时的整体进度, 提示文案)
+PIPELINE_STAGES = {
+    'load': (0.0, "📂 正在读取岗位数据..."),
+    'features': (0.3, "🧱 正在构建岗位特征索引..."),
+    'filter': (0.6, "🎓 正在执行严格学历过滤..."),
+    'score': (0.65, "🧮 正在进行七维加权评分..."),
+    'rank': (0.9, "🏆 正在排序并生成推荐理由..."),
+    'done': (1.0, "✅ 推荐报告已生成"),
+}
@@ -0,0 +1,170 @@
+# ==========================================
+# 第4步 岗位透视驾驶舱 的统计口径 (与界面解耦，便于基准测试计时)
+# 统计预聚合为 (显示区域 × 行业 × 薪资段) 的计数/薪资求和立方体，四张图与指标卡都从立方体取边际汇总
+# ==========================================
+import numpy as np
+import pandas as pd
+
+from .profiling import stage
+
+SALARY_BINS = [0, 5000, 8000, 12000, 20000, 100000]
+SALARY_LABELS = ['5k以下', '5k-8k', '8k-12k', '12k-20k', '20k以上']
+# 立方体薪资段维度多一格，存放不在任何薪资段内的岗位 (薪资为 0 / 缺失 / 超出上限)
+_NO_BAND = len(SALARY_LABELS)
+
+
+def _factorize(series):
+    # (编码, 取值)，缺失值占最后一格；分类列按类别顺序编号，与 value_counts 同数量时的先后一致
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy().astype(np.int64)
+        uniques = list(series.cat.categories)
+    else:
+        codes, uniques = pd.factorize(series.astype(object))
+        uniques = list(uniques)
+    return np.where(codes < 0, len(uniques), codes), uniques + [np.nan]
+
+
+def smart_location_name(loc_str, user_cities):
+    # 智能地址清洗：去掉省名与用户意向城市名，只剩区县 (为空时视为全城)
+    loc_str = str(loc_str).replace("广东省", "")
+    for city in user_cities:
+        if city in loc_str:
+            loc_str = loc_str.replace(city, "")
+    return loc_str if loc_str.strip() else "市辖区/全城"
+
+
+def _band_codes(salary):
+    # 与 pd.cut(right=True) 相同的区间 (下界开、上界闭)；不在任何区间内的记为 _NO_BAND (含 NaN)
+    codes = np.searchsorted(SALARY_BINS, salary, side='left') - 1
+    valid = (codes >= 0) & (codes < len(SALARY_LABELS)) & (salary > SALARY_BINS[0])
+    return np.where(valid, codes, _NO_BAND)
+
+
+def display_area(top_jobs, user_cities):
+    # 只对去重后的地址 (分类列为各类别) 做清洗，再按编码展开到行
+    # 结果为分类列 (清洗后同名的地址合并为同一类别)
+    codes, uniques = _factorize(top_jobs['工作地区'])
+    name_codes, names = pd.factorize(np.array([smart_location_name(u, user_cities) for u in uniques], dtype=object))
+    return pd.Series(pd.Categorical.from_codes(name_codes[codes], categories=names), index=top_jobs.index)
+
+
+def salary_band(top_jobs):
+    # 等价于 pd.cut(平均薪资, SALARY_BINS, labels=SALARY_LABELS)，直接由区间编号构造分类列
+    codes = _band_codes(top_jobs['平均薪资'].to_numpy(dtype=np.float64))
+    band = pd.Categorical.from_codes(np.where(codes == _NO_BAND, -1, codes), categories=SALARY_LABELS, ordered=True)
+    return pd.Series(band, index=top_jobs.index, name='平均薪资')
+
+
+def _count_series(counts, labels, name):
+    # 与 value_counts 的输出形式一致：按数量降序 (同数量按标签登记顺序)，索引名为原列名，不含 0
+    series = pd.Series(counts, index=pd.Index(labels, dtype=object, name=name), dtype='int64', name='count')
+    series = series[series > 0]
+    return series.iloc[np.argsort(-series.to_numpy(), kind='stable')]
+
+
+def _merge_labels(table, codes, uniques, label=None):
+    # 把本批编码映射到立方体的标签编号：只登记实际出现的取值 (label 为取值到标签的清洗函数)，
+    # 新标签追加在末尾；缺失值统一记为 None
+    ids = np.zeros(len(uniques), dtype=np.int64)
+    for i in np.flatnonzero(np.bincount(codes, minlength=len(uniques))):
+        value = uniques[i] if label is None else label(uniques[i])
+        ids[i] = table.setdefault(None if pd.isna(value) else value, len(table))
+    return ids[codes]
+
+
+class StatsCube:
+    # 立方体 count / salary_sum / salary_n 的形状为 (显示区域, 行业, 薪资段 + 1)
+    # from_jobs 一次向量化扫描建好；流式推荐时用 add 按块累加，不保留入选岗位本身
+    # summary() 的结构与 summarize_jobs 的返回值相同，结果会被记住直到下一次 add
+    def __init__(self, user_cities):
+        self.user_cities = list(user_cities)
+        self.areas = {}
+        self.industries = {}
+        shape = (0, 0, len(SALARY_LABELS) + 1)
+        self.count = np.zeros(shape, dtype=np.int64)
+        self.salary_sum = np.zeros(shape, dtype=np.float64)
+        self.salary_n = np.zeros(shape, dtype=np.int64)
+        self._summary = None
+
+    @classmethod
+    def from_jobs(cls, jobs, user_cities):
+        cube = cls(user_cities)
+        cube.add(jobs)
+        return cube
+
+    @property
+    def n_jobs(self):
+        return int(self.count.sum())
+
+    def nbytes(self):
+        return self.count.nbytes + self.salary_sum.nbytes + self.salary_n.nbytes
+
+    def _grow(self):
+        # 新出现的区域/行业：立方体在对应维度补零
+        pad = [(0, len(self.areas) - self.count.shape[0]), (0, len(self.industries) - self.count.shape[1]), (0, 0)]
+        if pad[0][1] or pad[1][1]:
+            self.count = np.pad(self.count, pad)
+            self.salary_sum = np.pad(self.salary_sum, pad)
+            self.salary_n = np.pad(self.salary_n, pad)
+
+    def add(self, jobs):
+        # jobs 至少包含 工作地区 / 行业 / 平均薪资 三列
+        with stage('cube', rows_in=len(jobs)):
+            salary = jobs['平均薪资'].to_numpy(dtype=np.float64)
+            # 地区：在去重后的原始地址上做清洗，清洗后同名的地址并入同一格
+            area = _merge_labels(self.areas, *_factorize(jobs['工作地区']),
+                                 label=lambda loc: smart_location_name(loc, self.user_cities))
+            # 行业缺失也占一格 (与 value_counts 一样在汇总时剔除)
+            industry = _merge_labels(self.industries, *_factorize(jobs['行业']))
+            self._grow()
+
+            n_industry, n_band = self.count.shape[1:]
+            cell = (area * n_industry + industry) * n_band + _band_codes(salary)
+            size = self.count.size
+            has_salary = ~np.isnan(salary)
+            self.count += np.bincount(cell, minlength=size).reshape(self.count.shape)
+            self.salary_sum += np.bincount(cell[has_salary], weights=salary[has_salary],
+                                           minlength=size).reshape(self.count.shape)
+            self.salary_n += np.bincount(cell[has_salary], minlength=size).reshape(self.count.shape)
+            self._summary = None
+        return self
+
+    def summary(self):
+        if self._summary is not None:
+            return self._summary
+        industries = list(self.industries)
+        known = np.array([ind is not None for ind in industries], dtype=bool)
+        industry_sum = self.salary_sum.sum(axis=(0, 2))[known]
+        industry_n = self.salary_n.sum(axis=(0, 2))[known]
+        has_salary = industry_n > 0
+        industry_salary = pd.Series(industry_sum[has_salary] / industry_n[has_salary],
+                                    index=pd.Index(np.array(industries, dtype=object)[known][has_salary],
+                                                   dtype=object, name='行业'),
+                                    dtype='float64', name='平均薪资').sort_index()
+        salary_counts = pd.Series(self.count.sum(axis=(0, 1))[:_NO_BAND], name='count',
+                                  index=pd.CategoricalIndex(SALARY_LABELS, categories=SALARY_LABELS, ordered=True,
+                                                            name='薪资段'))
+        n_salary = int(self.salary_n.sum())
+        self._summary = {
+            'avg_salary': float(self.salary_sum.sum()) / n_salary if n_salary else float('nan'),
+            'area_counts': _count_series(self.count.sum(axis=(1, 2)), list(self.areas), '显示区域'),
+            'industry_counts': _count_series(self.count.sum(axis=(0, 2))[known],
+                                             np.array(industries, dtype=object)[known], '行业'),
+            'salary_counts': salary_counts,
+            'industry_salary': industry_salary,
+        }
+        return self._summary
+
+
+def annotate_jobs(top_jobs, user_cities):
+    # 为 top_jobs 添加 显示区域 / 薪资段 两列 (随结果一并导出)
+    top_jobs['显示区域'] = display_area(top_jobs, user_cities)
+    top_jobs['薪资段'] = salary_band(top_jobs)
+    return top_jobs
+
+
+def summarize_jobs(top_jobs, user_cities):
+    # 驾驶舱所需的全部统计；会为 top_jobs 添加 显示区域 / 薪资段 两列 (随结果一并导出)
+    with stage('aggregate', rows_in=len(top_jobs)):
+        annotate_jobs(top_jobs, user_cities)
+        return StatsCube.from_jobs(top_jobs, user_cities).summary()
@@ -0,0 +1,107 @@
+# ==========================================
+# 数据导入：上传 CSV 首次解析后转存为列式缓存 (Arrow IPC)，之后按文件哈希读取缓存
+# 缓存读取省去的是 CSV 解析与类型转换；转成 DataFrame 时数据仍会完整复制到内存 (并非零拷贝)
+#
+# 缓存位置：GDJOB_CACHE_DIR (缺省为当前工作目录下的 .gdjob_cache/)，每个不同的上传文件一个 <哈希>.arrow；
+# 超过 GDJOB_ARROW_CACHE_MAX_FILES 个或 GDJOB_ARROW_CACHE_MAX_MB 时删除最久未用的缓存文件
+# ==========================================
+import glob
+import hashlib
+import io
+import os
+import threading
+
+import pandas as pd
+
+from .constants import SALARY_COLS
+from .recommender import compact_job_table
+
+CACHE_DIR = os.environ.get('GDJOB_CACHE_DIR', '.gdjob_cache')
+ARROW_CACHE_MAX_FILES = int(os.environ.get('GDJOB_ARROW_CACHE_MAX_FILES', 8))
+ARROW_CACHE_MAX_MB = float(os.environ.get('GDJOB_ARROW_CACHE_MAX_MB', 2048))
+
+
+def _read_bytes(file):
+    # 支持 Streamlit 的 UploadedFile / 其他文件对象 / 本地路径
+    if hasattr(file, 'getvalue'):
+        return file.getvalue()
+    if hasattr(file, 'read'):
+        return file.read()
+    with open(file, 'rb') as f:
+        return f.read()
+
+
+def prepare_job_table(df):
+    # 类型化：薪资转数值，再压缩为紧凑表示
+    for col in SALARY_COLS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    return compact_job_table(df)
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_fingerprint(file):
+    return _digest(_read_bytes(file))
+
+
+def evict_cache_files(paths, max_files=None, max_bytes=None):
+    # 按修改时间 (命中时会刷新) 保留最近使用的文件，超出条数或总字节数的删除；至少保留最新的一个
+    # 只应传入已完成的缓存文件，正在写入的临时文件不要列入
+    sized = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        sized.append((stat.st_mtime, stat.st_size, path))
+    sized.sort(reverse=True)
+    total = 0
+    for i, (_, size, path) in enumerate(sized):
+        total += size
+        if i and ((max_files is not None and i >= max_files) or (max_bytes is not None and total > max_bytes)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def read_job_table(file, cache_dir=None):
+    data = _read_bytes(file)
+    try:
+        import pyarrow as pa
+    except ImportError:
+        # 未安装 pyarrow 时退回直接解析 CSV
+        return prepare_job_table(pd.read_csv(io.BytesIO(data)))
+
+    cache_dir = cache_dir or CACHE_DIR
+    path = os.path.join(cache_dir, _digest(data) + '.arrow')
+    if os.path.exists(path):
+        try:
+            os.utime(path)
+            # 内存映射只省去读文件的拷贝，to_pandas 仍会把各列复制为 DataFrame
+            with pa.memory_map(path, 'r') as source:
+                return pa.ipc.open_file(source).read_all().to_pandas()
+        except (OSError, pa.ArrowException):
+            # 缓存文件已被淘汰或损坏时重新解析
+            pass
+
+    df = prepare_job_table(pd.read_csv(io.BytesIO(data)))
+    # 临时文件按进程 + 线程区分：两个线程 (如后台预计算与前台、两个会话) 同时写同一缓存时各写各的，
+    # 内容相同，改名的先后不影响结果
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        os.makedirs(cache_dir, exist_ok=True)
+        with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, path)
+        evict_cache_files(glob.glob(os.path.join(cache_dir, '*.arrow')), ARROW_CACHE_MAX_FILES,
+                          ARROW_CACHE_MAX_MB * 1024 ** 2)
+    except (OSError, pa.ArrowException):
+        # 缓存写入失败 (只读目录、混合类型列等) 不影响本次使用；不留下写了一半的临时文件
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return df
@@ -0,0 +1,160 @@
+# ==========================================
+# 结果导出：按结果指纹缓存到磁盘，分块写出 CSV / Parquet / Excel，不在内存中拼出整个文件
+# 界面只在用户点击下载时才生成文件 (同一结果、同一格式只生成一次)
+# ==========================================
+import glob
+import os
+import threading
+
+import pandas as pd
+
+from .data import CACHE_DIR, evict_cache_files
+from .profiling import stage
+from .recommender import dataset_fingerprint
+
+EXPORT_CHUNK_ROWS = int(os.environ.get('GDJOB_EXPORT_CHUNK_ROWS', 20_000))
+# 磁盘上最多保留的导出文件数，超过时删除最久未用的
+EXPORT_CACHE_MAX_FILES = int(os.environ.get('GDJOB_EXPORT_CACHE_MAX_FILES', 16))
+# Excel 单个工作表的行数上限 (含表头)，超出部分写到后续工作表
+EXCEL_MAX_ROWS = 1_048_576
+
+# 格式 -> (显示名称, 扩展名, MIME)
+EXPORT_FORMATS = {
+    'csv': ("CSV (Excel 可直接打开)", '.csv', 'text/csv'),
+    'parquet': ("Parquet (列式，体积小)", '.parquet', 'application/vnd.apache.parquet'),
+    'xlsx': ("Excel 工作簿", '.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+
+_LOCKS = {}
+_LOCKS_LOCK = threading.Lock()
+
+
+def _has_module(name):
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
+
+
+def available_formats():
+    # CSV 始终可用；Parquet 需要 pyarrow，Excel 需要 xlsxwriter 或 openpyxl (均为可选依赖)
+    formats = ['csv']
+    if _has_module('pyarrow'):
+        formats.append('parquet')
+    if _has_module('xlsxwriter') or _has_module('openpyxl'):
+        formats.append('xlsx')
+    return formats
+
+
+def _chunks(df, chunk_rows):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def _write_csv(df, path, chunk_rows):
+    # 带 BOM 的 UTF-8，Excel 打开中文不乱码；与 df.to_csv(index=False).encode('utf-8-sig') 逐字节一致
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        df.iloc[:0].to_csv(f, index=False)
+        for chunk in _chunks(df, chunk_rows):
+            chunk.to_csv(f, index=False, header=False)
+
+
+def _write_parquet(df, path, chunk_rows):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # 模式按整表推断一次，避免某一块全为空值时列类型不一致
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in _chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def _excel_rows(df, chunk_rows):
+    # 逐块转成 Python 值的行，缺失值写为空单元格
+    for chunk in _chunks(df, chunk_rows):
+        values = chunk.astype(object).to_numpy()
+        values[pd.isna(values)] = None
+        yield from values.tolist()
+
+
+def _write_xlsx(df, path, chunk_rows):
+    header = [str(c) for c in df.columns]
+    per_sheet = EXCEL_MAX_ROWS - 1
+    try:
+        import xlsxwriter
+    except ImportError:
+        xlsxwriter = None
+
+    if xlsxwriter is not None:
+        # constant_memory：按行顺序写出并立即落盘，内存占用与行数无关
+        with xlsxwriter.Workbook(path, {'constant_memory': True}) as workbook:
+            sheet = None
+            for i, row in enumerate(_excel_rows(df, chunk_rows)):
+                if i % per_sheet == 0:
+                    sheet = workbook.add_worksheet(f'推荐结果{i // per_sheet + 1}' if i else '推荐结果')
+                    sheet.write_row(0, 0, header)
+                sheet.write_row(i % per_sheet + 1, 0, row)
+            if sheet is None:
+                workbook.add_worksheet('推荐结果').write_row(0, 0, header)
+        return
+
+    from openpyxl import Workbook
+
+    # openpyxl 的只写模式同样逐行写出
+    workbook = Workbook(write_only=True)
+    sheet = None
+    for i, row in enumerate(_excel_rows(df, chunk_rows)):
+        if i % per_sheet == 0:
+            sheet = workbook.create_sheet(f'推荐结果{i // per_sheet + 1}' if i else '推荐结果')
+            sheet.append(header)
+        sheet.append(row)
+    if sheet is None:
+        workbook.create_sheet('推荐结果').append(header)
+    workbook.save(path)
+
+
+_WRITERS = {'csv': _write_csv, 'parquet': _write_parquet, 'xlsx': _write_xlsx}
+
+
+def _lock(path):
+    with _LOCKS_LOCK:
+        return _LOCKS.setdefault(path, threading.Lock())
+
+
+def _evict(export_dir, keep):
+    # 只清理已完成的导出文件，正在写入的临时文件不动
+    files = [path for _, ext, _ in EXPORT_FORMATS.values() for path in glob.glob(os.path.join(export_dir, '*' + ext))]
+    evict_cache_files(files, max_files=keep)
+
+
+def export_path(df, fmt='csv', fingerprint=None, cache_dir=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    # 返回导出文件的路径；同一结果 (fingerprint，缺省按内容计算) 与格式已导出过时直接复用
+    if fmt not in _WRITERS:
+        raise ValueError(f"不支持的导出格式: {fmt}")
+    fingerprint = fingerprint or dataset_fingerprint(df)
+    export_dir = os.path.join(cache_dir or CACHE_DIR, 'exports')
+    path = os.path.join(export_dir, fingerprint + EXPORT_FORMATS[fmt][1])
+    with _lock(path):
+        if os.path.exists(path):
+            os.utime(path)
+            return path
+        os.makedirs(export_dir, exist_ok=True)
+        # 先写临时文件再改名，中途失败不会留下不完整的导出
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with stage('export', rows_in=len(df), format=fmt):
+            try:
+                _WRITERS[fmt](df, tmp_path, chunk_rows)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        _evict(export_dir, EXPORT_CACHE_MAX_FILES)
+    return path
+
+
+def read_export(df, fmt='csv', fingerprint=None):
+    # 导出内容 (bytes)，可直接作为 st.download_button 的数据；读完即关闭文件
+    with open(export_path(df, fmt, fingerprint), 'rb') as f:
+        return f.read()
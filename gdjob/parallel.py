@@ -0,0 +1,138 @@
+# ==========================================
+# 多进程并行评分：特征索引的逐行数组放入共享内存，按行区间分区后在进程池中评分，再合并各分区 Top-K
+# 每行的计算与串行路径完全相同，合并时按 (得分降序, 行号升序) 排序，结果与串行逐位一致
+# ==========================================
+import multiprocessing as mp
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .constants import EDU_MAP, FALLBACK_TOP_N, HIGH_SCORE_THRESHOLD
+from .recommender import RECOMMENDER_CACHE_MAX_DATASETS, JobFeatureIndex, rank_top_jobs, request_key, \
+    weighted_total
+
+# 评分只用到这些逐行数组；文本索引与取值表留在主进程
+ROW_ARRAYS = ['edu_val', 'exp_class', 'title_codes', 'category_mask', 'growth_count', 'stable',
+              'area_codes', 'industry_codes', 'avg_salary']
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+# 工作进程内已映射的共享内存：按数据集复用，只保留最近几个数据集的映射
+_ATTACHED = OrderedDict()
+
+
+def _release(blocks):
+    for shm in blocks:
+        try:
+            shm.close()
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedFeatures:
+    # 把逐行特征复制到共享内存 (每个数据集一次)；spec 为 {数组名: (共享内存名, dtype, shape)}，可直接传给工作进程
+    def __init__(self, features):
+        self.n_rows = features.n_rows
+        self.spec = {}
+        blocks = []
+        for name in ROW_ARRAYS:
+            array = np.ascontiguousarray(getattr(features, name))
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks.append(shm)
+            np.ndarray(array.shape, array.dtype, buffer=shm.buf)[:] = array
+            self.spec[name] = (shm.name, array.dtype.str, array.shape)
+        # 对象被回收或进程退出时释放共享内存
+        self._finalizer = weakref.finalize(self, _release, blocks)
+
+    def close(self):
+        self._finalizer()
+
+
+def _attach(spec):
+    # 工作进程：用共享内存中的数组拼出一个只含逐行特征的 JobFeatureIndex (不复制数据)
+    key = tuple(shm_name for shm_name, _, _ in spec.values())
+    blocks = _ATTACHED.get(key)
+    if blocks is None:
+        blocks = _ATTACHED[key] = [shared_memory.SharedMemory(name=shm_name) for shm_name in key]
+        while len(_ATTACHED) > RECOMMENDER_CACHE_MAX_DATASETS:
+            for shm in _ATTACHED.popitem(last=False)[1]:
+                shm.close()
+    _ATTACHED.move_to_end(key)
+    view = JobFeatureIndex.__new__(JobFeatureIndex)
+    for shm, (name, (_, dtype, shape)) in zip(blocks, spec.items()):
+        setattr(view, name, np.ndarray(shape, np.dtype(dtype), buffer=shm.buf))
+    view.n_rows = len(view.edu_val)
+    return view
+
+
+def _score_partition(spec, lo, hi, user_profile, tables, weights, threshold, keep):
+    # 对行区间 [lo, hi) 评分；keep 为 None 时返回全部 (行号, 各维得分, 综合得分)，否则只返回本分区的候选
+    # weights 为 None 时只算各维得分 (综合得分为 None)
+    view = _attach(spec)
+    view._user_tables = (request_key(user_profile), tables)
+    user_edu_val = EDU_MAP.get(user_profile['education'], 3)
+    rows = lo + np.flatnonzero(view.edu_val[lo:hi] <= user_edu_val)
+    dims = view.score_dimensions(rows, user_profile, user_edu_val)
+    if weights is None:
+        return rows, dims, None
+    total = weighted_total(dims, weights)
+    if keep is None:
+        return rows, dims, total
+    # 候选按行号排序，合并后同分时仍保持原顺序
+    picked = np.sort(rank_top_jobs(total, threshold, keep))
+    return rows[picked], total[picked]
+
+
+def _pool(workers):
+    # 进程池按进程数复用；forkserver/spawn 避免在多线程的 Streamlit 进程里 fork
+    with _POOLS_LOCK:
+        pool = _POOLS.get(workers)
+        if pool is None:
+            methods = mp.get_all_start_methods()
+            ctx = mp.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            pool = _POOLS[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+        return pool
+
+
+class ParallelScorer:
+    def __init__(self, features, workers):
+        self.features = features
+        self.workers = workers
+        self.shared = SharedFeatures(features)
+
+    def _partitions(self):
+        bounds = np.linspace(0, self.features.n_rows, self.workers + 1).astype(np.int64)
+        return [(int(lo), int(hi)) for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+
+    def _map(self, user_profile, weights, threshold, keep):
+        # 取值级查表在主进程算一次，随任务发给各分区
+        tables = self.features.user_tables(user_profile)
+        pool = _pool(self.workers)
+        futures = [pool.submit(_score_partition, self.shared.spec, lo, hi, user_profile, tables, weights,
+                               threshold, keep)
+                   for lo, hi in self._partitions()]
+        return [f.result() for f in futures]
+
+    def score(self, user_profile, weights=None):
+        # 全部通过学历过滤的行：(行号, 各维得分, 综合得分)，同 JobRecommender._score；不传权重时综合得分为 None
+        parts = self._map(user_profile, weights, None, None)
+        rows = np.concatenate([p[0] for p in parts])
+        dims = {col: np.concatenate([p[1][col] for p in parts]) for col in JobFeatureIndex.DIMENSION_SCORERS}
+        total = None if weights is None else np.concatenate([p[2] for p in parts])
+        return rows, dims, total
+
+    def top(self, user_profile, weights, threshold=HIGH_SCORE_THRESHOLD, fallback_k=FALLBACK_TOP_N):
+        # 各分区返回 高分岗位 (若有) 或 本分区前 fallback_k 名，合并后再按同一规则选取，等价于全量 rank_top_jobs
+        parts = self._map(user_profile, weights, threshold, fallback_k)
+        rows = np.concatenate([p[0] for p in parts])
+        total = np.concatenate([p[1] for p in parts])
+        picked = rank_top_jobs(total, threshold, fallback_k)
+        return rows[picked], total[picked]
+
+    def close(self):
+        self.shared.close()
@@ -0,0 +1,44 @@
+# ==========================================
+# 推荐流水线：读取 → 构建特征 → 学历过滤 → 评分 → 排序，逐阶段汇报真实进度
+# ==========================================
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from .data import file_fingerprint, read_job_table
+from .profiling import stage
+from .recommender import JobRecommender, recommender_cache, report_progress
+
+# 后台预计算用的线程池 (numpy/pyarrow 计算大多释放 GIL，不阻塞界面线程)
+_BACKGROUND = ThreadPoolExecutor(max_workers=2, thread_name_prefix='gdjob-prefetch')
+_log = logging.getLogger(__name__)
+
+
+def prepare_recommender(file, progress=None, fingerprint=None):
+    # 已缓存的数据集直接复用，否则读取并构建特征索引；已知指纹时传入 fingerprint，省去对整个文件求哈希
+    # 读取也放在缓存的构建函数里：后台预计算正在准备同一文件时，前台等待它完成而不是重复解析
+    fingerprint = fingerprint or file_fingerprint(file)
+
+    def build():
+        report_progress(progress, 'load')
+        with stage('load') as s:
+            df = read_job_table(file)
+            s.rows_out = len(df)
+        report_progress(progress, 'features')
+        return JobRecommender(df, fingerprint)
+
+    return recommender_cache().get_or_create(fingerprint, build)
+
+
+def prefetch(file, user_profile, fingerprint=None):
+    # 用户画像确定后 (第2步结束) 即在后台准备数据并计算七维得分，第3步只剩加权与排序
+    def task():
+        prepare_recommender(file, fingerprint=fingerprint).prepare(user_profile)
+
+    def log_failure(future):
+        # 调用方通常不等待结果：后台出错 (文件格式错误等) 时记入日志，第3步前台计算会再次报告给用户
+        if not future.cancelled() and future.exception() is not None:
+            _log.error("后台预计算失败", exc_info=future.exception())
+
+    future = _BACKGROUND.submit(task)
+    future.add_done_callback(log_failure)
+    return future
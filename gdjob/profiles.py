@@ -0,0 +1,84 @@
+# ==========================================
+# 画像接口 (批量推荐 batch.py 与 HTTP 服务 serve.py 共用)：画像缺省值与校验、权重推导、Top-K 结果序列化
+# 仅依赖常量与权重推导，导入不加载 pandas；评分由传入的 JobRecommender 完成
+# ==========================================
+import math
+from numbers import Real
+
+from .constants import EDU_MAP, JOB_CATEGORY_KEYWORDS, SCORE_DIMENSIONS
+from .weights import derive_weights
+
+# 画像缺省值与第1~3步控件的默认选项一致
+PROFILE_DEFAULTS = {
+    'education': '大学本科', 'major': '', 'experience': '应届生', 'min_salary': 5000,
+    'preferred_cities': [], 'district': '', 'job_category': list(JOB_CATEGORY_KEYWORDS)[0],
+    'preferred_industries': [], 'q1': '', 'q2': 50,
+}
+# 可接受的学历：第1步的选项与 EDU_MAP 中的写法
+EDUCATION_LEVELS = ["博士", "硕士", "大学本科", "大学专科", "中专/高中"] + [e for e in EDU_MAP if e]
+TEXT_FIELDS = ['education', 'major', 'experience', 'district', 'job_category', 'q1']
+LIST_FIELDS = ['preferred_cities', 'preferred_industries']
+OUTPUT_COLUMNS = ['岗位ID', '职位名称', '单位名称', '工作地区', '行业', '薪资下限', '薪资上限', '综合得分', '推荐理由']
+
+
+def _is_number(value):
+    # bool 是 int 的子类，JSON 的 true/false 不能当作数值
+    return isinstance(value, Real) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def normalize_profile(raw):
+    # 补齐缺省值并校验字段类型与取值范围，返回带 "weights" 的完整画像；不合法时抛出 ValueError (说明哪个字段)
+    # 评分代码假定这些约束成立：如 min_salary 为 0 时薪资得分为 NaN，字符串被当作城市列表时会逐字匹配
+    if not isinstance(raw, dict):
+        raise ValueError("画像须为 JSON 对象")
+    profile = {**PROFILE_DEFAULTS, **raw}
+    for field in TEXT_FIELDS:
+        if not isinstance(profile[field], str):
+            raise ValueError(f"{field} 须为字符串")
+    if profile['education'] not in EDUCATION_LEVELS:
+        raise ValueError(f"education 须为以下之一: {'、'.join(dict.fromkeys(EDUCATION_LEVELS))}")
+    if not _is_number(profile['min_salary']) or profile['min_salary'] <= 0:
+        raise ValueError("min_salary 须为大于 0 的数值")
+    for field in LIST_FIELDS:
+        values = profile[field]
+        if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+            raise ValueError(f"{field} 须为字符串列表")
+    if not _is_number(profile['q2']) or not 0 <= profile['q2'] <= 100:
+        raise ValueError("q2 须为 0~100 的数值")
+    weights = profile.get('weights')
+    if weights not in (None, {}):
+        keys = [key for _, key in SCORE_DIMENSIONS]
+        if not isinstance(weights, dict) or sorted(weights) != sorted(keys):
+            raise ValueError(f"weights 须为包含 {'/'.join(keys)} 的对象")
+        if not all(_is_number(v) and v >= 0 for v in weights.values()):
+            raise ValueError("weights 的各项须为非负数值")
+    profile['weights'] = profile_weights(profile)
+    return profile
+
+
+def profile_weights(profile):
+    # 画像中直接给出的 "weights" 优先，否则按第3步问卷答案 (q1/q2) 推导
+    return profile.get('weights') or derive_weights(profile['q1'], profile['q2'])
+
+
+def to_records(top):
+    # 结果表 → [{rank, 列名: 值}]，numpy 标量转为 Python 值，缺失值为 None (可直接 json.dumps)
+    columns = [c for c in OUTPUT_COLUMNS if c in top.columns]
+    records = []
+    for rank, row in enumerate(top[columns].itertuples(index=False), 1):
+        record = {'rank': rank}
+        for col, value in zip(columns, row):
+            if isinstance(value, float) and math.isnan(value):
+                value = None
+            elif hasattr(value, 'item'):
+                value = value.item()
+            record[col] = value
+        records.append(record)
+    return records
+
+
+def score_profile(recommender, profile, k):
+    # 一个画像的 Top-K 推荐：{"id", "weights", "results"}
+    weights = profile_weights(profile)
+    top = recommender.top_k(profile, weights, k, columns=OUTPUT_COLUMNS)
+    return {'id': profile.get('id'), 'weights': weights, 'results': to_records(top)}
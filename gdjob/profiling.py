@@ -0,0 +1,143 @@
+# ==========================================
+# 分阶段性能诊断 (可选)：记录各阶段耗时、行数变化与内存变化，可导出为 JSON Lines
+# 用法：with StageProfiler() as profiler: ...；流水线内部用 stage(名称) 标记阶段
+# 未启用时 stage() 返回空操作对象，几乎没有额外开销
+# ==========================================
+import contextvars
+import itertools
+import json
+import time
+
+# 当前生效的诊断器 (按线程/上下文隔离，后台预计算线程不会记到界面会话里)
+_ACTIVE = contextvars.ContextVar('gdjob_profiler', default=None)
+_RUN_IDS = itertools.count(1)
+
+
+def _proc_status_mb(field):
+    # Linux 下读取 /proc/self/status，其他平台返回 None
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _delta(after, before):
+    return None if after is None or before is None else round(after - before, 2)
+
+
+class _Stage:
+    def __init__(self, profiler, name, rows_in, fields):
+        self.profiler = profiler
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.fields = fields
+
+    def __enter__(self):
+        self.parent = self.profiler._stack[-1] if self.profiler._stack else None
+        self.depth = len(self.profiler._stack)
+        self.profiler._stack.append(self.name)
+        self._rss = _proc_status_mb('VmRSS')
+        self._peak = _proc_status_mb('VmHWM')
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        self.profiler._stack.pop()
+        rss = _proc_status_mb('VmRSS')
+        self.profiler._record({
+            'stage': self.name,
+            'parent': self.parent,
+            'depth': self.depth,
+            'start_ms': round((self._start - self.profiler._origin) * 1000, 3),
+            'wall_ms': round((end - self._start) * 1000, 3),
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'rss_mb': None if rss is None else round(rss, 1),
+            # 常驻内存变化 (受同进程其他会话影响，仅供参考) 与阶段内新增的峰值
+            'mem_delta_mb': _delta(rss, self._rss),
+            'peak_delta_mb': _delta(_proc_status_mb('VmHWM'), self._peak),
+            'error': exc_type.__name__ if exc_type else None,
+            **self.fields,
+        })
+        return False
+
+
+class _NullStage:
+    # 未启用诊断时使用，忽略所有属性赋值
+    rows_out = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name, rows_in=None, **fields):
+    # 标记一个阶段：with stage('filter', rows_in=n) as s: ...; s.rows_out = m
+    profiler = _ACTIVE.get()
+    if profiler is None:
+        return _NULL_STAGE
+    return _Stage(profiler, name, rows_in, fields)
+
+
+def activate(profiler):
+    # 为当前上下文设置 (或以 None 关闭) 诊断器；Streamlit 每次重跑脚本时调用一次
+    _ACTIVE.set(profiler)
+    return profiler
+
+
+def to_jsonl(records):
+    return ''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records)
+
+
+class StageProfiler:
+    # 一次运行 (一次脚本执行/一次推荐) 的阶段记录；records 可传入外部列表以跨运行累积
+    def __init__(self, run_id=None, label=None, records=None, max_records=5000, log_path=None):
+        self.run_id = run_id or f"{time.strftime('%Y%m%dT%H%M%S')}-{next(_RUN_IDS)}"
+        self.label = label
+        self.records = records if records is not None else []
+        self.max_records = max_records
+        self.log_path = log_path
+        self._stack = []
+        self._origin = time.perf_counter()
+        self._token = None
+
+    def __enter__(self):
+        self._token = _ACTIVE.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _ACTIVE.reset(self._token)
+        return False
+
+    def _record(self, record):
+        record = {'run': self.run_id, 'label': self.label, **record}
+        self.records.append(record)
+        if self.max_records and len(self.records) > self.max_records:
+            del self.records[:len(self.records) - self.max_records]
+        if self.log_path:
+            # 设置了日志文件时同步追加，便于离线分析
+            try:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(to_jsonl([record]))
+            except OSError:
+                pass
+
+    def run_records(self):
+        return [r for r in self.records if r['run'] == self.run_id]
+
+    def to_jsonl(self):
+        return to_jsonl(self.records)
@@ -0,0 +1,688 @@
+# ==========================================
+# 核心逻辑层：特征索引、评分、排序与推荐理由
+# ==========================================
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from .cache import LRUCache
+from .constants import (
+    CATEGORICAL_COLS, CATEGORY_MAX_RATIO, EDU_MAP, FALLBACK_TOP_N, GROWTH_KEYWORDS, HIGH_SCORE_THRESHOLD,
+    JOB_CATEGORY_KEYWORDS, PIPELINE_STAGES, SCORE_DIMENSIONS, STABLE_KEYWORDS,
+)
+from .dashboard import StatsCube
+from .profiling import stage
+from .text_index import NgramIndex
+
+# 进程级缓存配置：已准备好的推荐器按数据集共享 (LRU + 内存上限)，结果按请求记忆
+RECOMMENDER_CACHE_MAX_DATASETS = int(os.environ.get('GDJOB_CACHE_MAX_DATASETS', 4))
+RECOMMENDER_CACHE_MAX_MB = float(os.environ.get('GDJOB_CACHE_MAX_MB', 1024))
+RESULT_CACHE_SIZE = 32
+RESULT_CACHE_MAX_MB = 128
+# 按用户画像缓存的七维得分 (与权重无关)，供后台预计算和仅调权重时复用
+DIMENSION_CACHE_MAX_MB = 64
+# 多进程并行评分：工作进程数 (1 表示串行) 与启用并行的最少行数 (小表的进程间开销大于收益)
+SCORING_WORKERS = int(os.environ.get('GDJOB_SCORING_WORKERS', 1))
+PARALLEL_MIN_ROWS = int(os.environ.get('GDJOB_PARALLEL_MIN_ROWS', 200_000))
+
+_SMALL_SERIES = 256
+
+
+def _contains_any(series, keywords):
+    # 关键词正则"或"匹配，一次扫描整列；空列表视为无命中
+    if not keywords:
+        return np.zeros(len(series), dtype=bool)
+    pattern = '|'.join(re.escape(kw) for kw in keywords)
+    return series.str.contains(pattern, regex=True).to_numpy(dtype=bool)
+
+
+def _contains(series, text):
+    # 与 `text in str(x)` 等价的整列子串匹配 (空串恒为 True)
+    if len(series) <= _SMALL_SERIES:
+        # 去重后的取值通常很少，直接循环比走 pandas 字符串访问器更快
+        return np.fromiter((text in v for v in series), dtype=bool, count=len(series))
+    return series.str.contains(text, regex=False).to_numpy(dtype=bool)
+
+
+def _is_substring_of(series, text):
+    # 与 `str(x) in text` 等价：x 必须是 text 的某个子串
+    substrings = {text[i:j] for i in range(len(text) + 1) for j in range(i, len(text) + 1)}
+    return series.isin(substrings).to_numpy(dtype=bool)
+
+
+def _contains_values(series, text):
+    # 同 _contains，分类列只在类别上匹配后按编码展开 (缺失值视为不命中)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        hit = _contains(pd.Series(series.cat.categories.astype(str), dtype=object), text)
+        return np.append(hit, False)[series.cat.codes.to_numpy()]
+    return _contains(series.astype(str), text)
+
+
+def _remove_unused_categories(series):
+    # 等价于 cat.remove_unused_categories()，用 bincount 统计出现的类别，避免对编码整体排序
+    codes = series.cat.codes.to_numpy()
+    categories = series.cat.categories
+    used = np.bincount(codes[codes >= 0], minlength=len(categories)) > 0
+    if used.all():
+        return series
+    remap = np.cumsum(used) - 1
+    new_codes = np.where(codes >= 0, remap[codes], -1).astype(codes.dtype)
+    return pd.Series(pd.Categorical.from_codes(new_codes, categories[used], ordered=series.cat.ordered),
+                     index=series.index, name=series.name)
+
+
+def _fill_blank(series):
+    # 缺失值填空串；分类列需先把空串加入类别
+    if isinstance(series.dtype, pd.CategoricalDtype) and '' not in series.cat.categories:
+        series = series.cat.add_categories('')
+    return series.fillna('')
+
+
+def _factorize(series):
+    # 字典编码：返回 (每行编码, 去重后的取值)，逐值计算的特征只需在取值上算一遍
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(dtype=np.int32), pd.Series(series.cat.categories.astype(str), dtype=object)
+    codes, uniques = pd.factorize(series.astype(str))
+    return codes.astype(np.int32), pd.Series(uniques, dtype=object)
+
+
+def weighted_total(dims, weights):
+    # 各维得分与权重的点积；逐列累加，顺序同旧实现，浮点结果逐位一致
+    # (int16 得分先升为 float64，整数在 float64 中精确表示，不会溢出也不改变结果)
+    total = None
+    for col, key in SCORE_DIMENSIONS:
+        term = dims[col].astype(np.float64) * weights[key]
+        total = term if total is None else total + term
+    return total / 100
+
+
+def _downcast_float(values):
+    # 能无损表示时降为 float32，否则保持 float64
+    values = np.asarray(values, dtype=np.float64)
+    narrow = values.astype(np.float32)
+    return narrow if np.array_equal(narrow, values, equal_nan=True) else values
+
+
+def compact_job_table(df):
+    # 紧凑表示：低基数文本列转分类、数值列降位宽；只替换列，不复制整表
+    df = df.copy(deep=False)
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_float_dtype(series):
+            df[col] = _downcast_float(series.to_numpy())
+        elif pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            if col in CATEGORICAL_COLS or series.nunique(dropna=False) <= len(series) * CATEGORY_MAX_RATIO:
+                df[col] = series.astype('category')
+    return df
+
+
+def clean_job_table(df):
+    # 紧凑表示 (分类列 + float32 薪资)，不保留对象类型的整表副本
+    df = compact_job_table(df)
+    # 数据清洗
+    low = pd.to_numeric(df['薪资下限'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+    high = pd.to_numeric(df['薪资上限'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+    df['薪资下限'] = _downcast_float(low)
+    df['薪资上限'] = _downcast_float(high)
+    df['平均薪资'] = _downcast_float((low + high) / 2)
+    # 填充缺失值
+    str_cols = ['职位名称', '行业', '工作地区', '单位名称', '单位性质', '学历要求', '经验要求']
+    for col in str_cols:
+        if col in df.columns:
+            df[col] = _fill_blank(df[col])
+        else:
+            df[col] = ''
+    return df
+
+
+def rank_top_jobs(scores, threshold=HIGH_SCORE_THRESHOLD, fallback_k=FALLBACK_TOP_N):
+    # 返回入选位置，按得分降序、同分保持原顺序 (等价于稳定全排序后再截取)：
+    # 有达到阈值的岗位时取全部高分岗位，否则取前 fallback_k 名
+    scores = np.asarray(scores)
+    candidates = np.flatnonzero(scores >= threshold)
+    if len(candidates) == 0:
+        k = min(fallback_k, len(scores))
+        if k == 0:
+            return candidates
+        # argpartition 思路：先找第 k 大的分数，只对不低于它的候选排序
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        candidates = np.flatnonzero(scores >= kth)
+        return candidates[np.argsort(-scores[candidates], kind='stable')][:k]
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+def report_progress(progress, stage):
+    # 通知进度回调：progress(阶段名, 已完成比例 0~1, 提示文案)，阶段见 PIPELINE_STAGES
+    if progress is not None:
+        fraction, message = PIPELINE_STAGES[stage]
+        progress(stage, fraction, message)
+
+
+def request_key(*parts):
+    # 用户画像 / 权重等参数的规范化键 (字典按键排序)；结果缓存与 HTTP 服务合并相同请求都按它判等
+    return json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def dataset_fingerprint(df):
+    # 数据集内容指纹 (列名 + 逐行哈希)
+    h = hashlib.blake2b(digest_size=16)
+    h.update('\x1f'.join(map(str, df.columns)).encode('utf-8'))
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def build_reasons(df, user_district):
+    # 向量化生成推荐理由：各标签条件为布尔掩码，组合成位编码后查表得到文案
+    if user_district:
+        near_home = _contains_values(df['工作地区'], user_district)
+    else:
+        near_home = np.zeros(len(df), dtype=bool)
+    tags = [
+        (near_home, f"🏠 离家近({user_district})"),
+        (~near_home & (df['S_城市'].to_numpy() >= 90), "📍 城市匹配"),
+        (df['S_薪资'].to_numpy() >= 110, "💰 薪资优厚"),
+        (df['S_稳定'].to_numpy() >= 90, "🛡️ 铁饭碗/稳定"),
+        (df['S_潜力'].to_numpy() >= 80, "📈 发展空间大"),
+        (df['S_专业'].to_numpy() >= 80, "🎯 专业对口"),
+    ]
+    code = np.zeros(len(df), dtype=np.int64)
+    for bit, (mask, _) in enumerate(tags):
+        code |= mask.astype(np.int64) << bit
+    table = np.empty(1 << len(tags), dtype=object)
+    for c in range(len(table)):
+        labels = [label for bit, (_, label) in enumerate(tags) if c >> bit & 1]
+        table[c] = " | ".join(labels) if labels else "✅ 综合条件匹配"
+    return table[code]
+
+
+def _build_reason(row, user_district):
+    tags = []
+    if user_district and user_district in str(row['工作地区']):
+        tags.append(f"🏠 离家近({user_district})")
+    elif row['S_城市'] >= 90:
+        tags.append("📍 城市匹配")
+    if row['S_薪资'] >= 110: tags.append("💰 薪资优厚")
+    if row['S_稳定'] >= 90: tags.append("🛡️ 铁饭碗/稳定")
+    if row['S_潜力'] >= 80: tags.append("📈 发展空间大")
+    if row['S_专业'] >= 80: tags.append("🎯 专业对口")
+    return " | ".join(tags) if tags else "✅ 综合条件匹配"
+
+
+class JobFeatureIndex:
+    # 与用户无关的岗位特征 (每个数据集只构建一次)，均为紧凑的整数/位掩码列
+    EXP_NO_LIMIT, EXP_FRESH, EXP_OTHER = 0, 1, 2
+
+    def __init__(self, df):
+        self.n_rows = len(df)
+
+        # 学历数值：如 "本科/硕士" 取 "本科"，未识别的视为不限(0)
+        first_req = df['学历要求'].astype(str).str.split('/', n=1).str[0]
+        self.edu_val = first_req.map(EDU_MAP).fillna(0).to_numpy(dtype=np.int8)
+
+        # 经验类别：无/不限 > 应届 > 其他
+        exp = df['经验要求'].astype(str)
+        self.exp_class = np.select(
+            [_contains_any(exp, ['无', '不限']), _contains(exp, '应届')],
+            [self.EXP_NO_LIMIT, self.EXP_FRESH], default=self.EXP_OTHER
+        ).astype(np.int8)
+
+        # 职位名称 / 行业 / 单位名称 的字典编码 + 取值上的 n-gram 倒排索引，关键词与专业匹配都走索引查询
+        self.title_codes, self.title_values = _factorize(df['职位名称'])
+        self.industry_codes, self.industry_values = _factorize(df['行业'])
+        self.title_index = NgramIndex(self.title_values)
+        self.industry_index = NgramIndex(self.industry_values)
+
+        # 职位名称：职能类别位掩码 + 潜力关键词命中数 (在去重后的名称上计算)
+        category_mask = np.zeros(len(self.title_values), dtype=self._mask_dtype(len(JOB_CATEGORY_KEYWORDS)))
+        for bit, keywords in enumerate(JOB_CATEGORY_KEYWORDS.values()):
+            category_mask |= np.where(self.title_index.contains_any(keywords), 1 << bit, 0).astype(category_mask.dtype)
+        self.category_mask = category_mask[self.title_codes]
+        self.growth_count = self.title_index.count_any(GROWTH_KEYWORDS)[self.title_codes]
+
+        # 稳定性：单位名称 + 单位性质 命中稳定关键词 (在去重后的组合上建索引，跨两列拼接处的命中也不遗漏)
+        name_codes, name_values = _factorize(df['单位名称'])
+        nature_codes, nature_values = _factorize(df['单位性质'])
+        n_nature = max(len(nature_values), 1)
+        pair_codes, pairs = pd.factorize(name_codes.astype(np.int64) * n_nature + nature_codes)
+        self.unit_codes = pair_codes.astype(np.int32)
+        unit_text = name_values.to_numpy()[pairs // n_nature] + nature_values.to_numpy()[pairs % n_nature]
+        self.unit_index = NgramIndex(unit_text)
+        self.stable = self.unit_index.contains_any(STABLE_KEYWORDS)[self.unit_codes]
+
+        # 工作地区的字典编码，城市、商圈匹配只在取值上计算
+        self.area_codes, self.area_values = _factorize(df['工作地区'])
+
+        self.avg_salary = df['平均薪资'].to_numpy()
+        self._user_tables = None
+
+    @staticmethod
+    def _mask_dtype(n_bits):
+        return np.min_scalar_type((1 << max(n_bits, 1)) - 1)
+
+    def nbytes(self):
+        arrays = [v for v in vars(self).values() if isinstance(v, np.ndarray)]
+        indexes = [v for v in vars(self).values() if isinstance(v, NgramIndex)]
+        return sum(a.nbytes for a in arrays) + sum(index.nbytes() for index in indexes)
+
+    # ------------------------------------------
+    # 单用户评分：查表 + 按编码取值，不再扫描原始文本
+    # ------------------------------------------
+    def eligible_rows(self, user_edu_val):
+        # 学历硬过滤：保留 (岗位要求 <= 用户学历) 的行号
+        return np.flatnonzero(self.edu_val <= user_edu_val)
+
+    # 各维度评分函数 (列名 -> 方法名)，可单独调用以便按维度计时
+    DIMENSION_SCORERS = {
+        'S_学历': '_score_education',
+        'S_经验': '_score_experience',
+        'S_专业': '_score_major',
+        'S_薪资': '_score_salary',
+        'S_城市': '_score_city',
+        'S_稳定': '_score_stability',
+        'S_潜力': '_score_growth',
+    }
+
+    def score_dimensions(self, rows, user_profile, user_edu_val):
+        dims = {}
+        for col in self.DIMENSION_SCORERS:
+            with stage(col, rows_in=len(rows)):
+                dims[col] = self.score_dimension(col, rows, user_profile, user_edu_val)
+        return dims
+
+    def score_dimension(self, col, rows, user_profile, user_edu_val):
+        return getattr(self, self.DIMENSION_SCORERS[col])(rows, user_profile, user_edu_val)
+
+    def _score_education(self, rows, user_profile, user_edu_val):
+        # 学历：刚好匹配给100，向下兼容给85
+        return np.where(self.edu_val[rows] == user_edu_val, 100, 85).astype(np.int16)
+
+    def _score_experience(self, rows, user_profile, user_edu_val):
+        if user_profile['experience'] == "应届生":
+            exp_table = np.array([100, 100, 60], dtype=np.int16)
+        else:
+            exp_table = np.array([100, 70, 90], dtype=np.int16)
+        return exp_table[self.exp_class[rows]]
+
+    def _score_major(self, rows, user_profile, user_edu_val):
+        # 专业与职能契合度
+        categories = list(JOB_CATEGORY_KEYWORDS)
+        score = np.zeros(len(rows), dtype=np.int16)
+        if user_profile['job_category'] in categories:
+            bit = 1 << categories.index(user_profile['job_category'])
+            score += np.where(self.category_mask[rows] & bit, 50, 0)
+        tables = self.user_tables(user_profile)
+        score += np.where(tables['industry_hit'][self.industry_codes[rows]], 30, 0)
+        major_hit = (tables['major_title'][self.title_codes[rows]]
+                     | tables['major_industry'][self.industry_codes[rows]])
+        score += np.where(major_hit, 20, 0)
+        return np.minimum(score, 100).astype(np.int16)
+
+    def _score_salary(self, rows, user_profile, user_edu_val):
+        # 薪资竞争力
+        min_expect = user_profile['min_salary']
+        avg_salary = self.avg_salary[rows].astype(np.float64)
+        return np.where(avg_salary >= min_expect * 0.9, np.minimum(120, avg_salary / min_expect * 100), 40)
+
+    def _score_city(self, rows, user_profile, user_edu_val):
+        # 城市与通勤 (按地区取值计算后按编码展开)
+        return self.user_tables(user_profile)['area_scores'][self.area_codes[rows]]
+
+    def _score_stability(self, rows, user_profile, user_edu_val):
+        return np.where(self.stable[rows], 100, 60).astype(np.int16)
+
+    def _score_growth(self, rows, user_profile, user_edu_val):
+        return np.minimum(60 + 15 * self.growth_count[rows].astype(np.int16), 100)
+
+    def user_tables(self, user_profile):
+        # 只依赖用户画像、按取值计算的查表 (行业/专业命中、地区得分)；记住最近一个画像的结果
+        # 并行评分时由主进程算好后直接交给工作进程，工作进程无需文本索引
+        key = request_key(user_profile)
+        cached = self._user_tables
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        industry_hit = np.zeros(len(self.industry_values), dtype=bool)
+        for ind in user_profile['preferred_industries']:
+            industry_hit |= self.industry_index.contains(ind[:2]) | _is_substring_of(self.industry_values, ind)
+        major = user_profile['major']
+        tables = {
+            'industry_hit': industry_hit,
+            'major_title': self.title_index.contains(major),
+            'major_industry': self.industry_index.contains(major),
+            'area_scores': self._area_scores(user_profile['preferred_cities'],
+                                             user_profile.get('district', '')).astype(np.int16),
+        }
+        self._user_tables = (key, tables)
+        return tables
+
+    def _area_scores(self, user_cities, user_district):
+        location = self.area_values
+        conditions = [_contains(location, city) for city in user_cities[:3]]
+        choices = [100, 90, 85][:len(conditions)]
+        conditions.append(_contains_any(location, ['广州', '深圳']))
+        choices.append(60)
+        score = np.select(conditions, choices, default=40)
+        if user_district:
+            score = score + np.where(_contains(location, user_district), 20, 0)
+        return np.minimum(score, 120)
+
+
+class JobRecommender:
+    def __init__(self, df, fingerprint=None):
+        with stage('clean', rows_in=len(df)) as s:
+            self.df = clean_job_table(df)
+            s.rows_out = len(self.df)
+        # 与用户无关的特征归推荐器所有，随推荐器一起缓存与淘汰 (推荐器按数据集指纹共享，见 get_recommender)
+        self.fingerprint = fingerprint or dataset_fingerprint(self.df)
+        with stage('features', rows_in=len(self.df)):
+            self.features = JobFeatureIndex(self.df)
+        # 清洗后的表与特征索引构建后不再变化，大小只算一次
+        self._base_nbytes = int(self.df.memory_usage(deep=True).sum()) + self.features.nbytes()
+        # 推荐结果按 (用户画像, 权重) 记忆，同一页面重跑不再重复计算
+        # 以下内部缓存增长时计入推荐器大小，整体受 RECOMMENDER_CACHE_MAX_MB 约束 (见 _cache_changed)
+        self._results = LRUCache(max_entries=RESULT_CACHE_SIZE, max_bytes=RESULT_CACHE_MAX_MB * 1024 ** 2,
+                                 sizeof=lambda df: int(df.memory_usage(deep=True).sum()),
+                                 on_change=self._cache_changed)
+        self._dimensions = LRUCache(max_bytes=DIMENSION_CACHE_MAX_MB * 1024 ** 2,
+                                    sizeof=lambda entry: entry[0].nbytes + sum(v.nbytes for v in entry[1].values()),
+                                    on_change=self._cache_changed)
+        # 第4步驾驶舱的预聚合统计，与推荐结果同键缓存
+        self._cubes = LRUCache(max_entries=RESULT_CACHE_SIZE, sizeof=lambda cube: cube.nbytes(),
+                               on_change=self._cache_changed)
+        # 多进程评分 (见 parallel.py)：行数达到 PARALLEL_MIN_ROWS 且 workers > 1 时启用，首次使用时才建共享内存
+        self.workers = SCORING_WORKERS
+        self._parallel = None
+
+    def _parallel_scorer(self):
+        if self.workers <= 1 or self.features.n_rows < PARALLEL_MIN_ROWS:
+            return None
+        if self._parallel is None or self._parallel.workers != self.workers:
+            from .parallel import ParallelScorer
+            self._parallel = ParallelScorer(self.features, self.workers)
+        return self._parallel
+
+    def _caches(self):
+        return [self._results, self._dimensions, self._cubes]
+
+    def nbytes(self):
+        return self._base_nbytes + sum(cache.total_bytes for cache in self._caches())
+
+    def _cache_changed(self, cache):
+        # 内部缓存变化后：先把该缓存收紧到全局内存上限剩余的空间内，再让进程级缓存按新大小重新淘汰
+        others = sum(c.total_bytes for c in self._caches() if c is not cache)
+        cache.trim(max(RECOMMENDER_CACHE_MAX_MB * 1024 ** 2 - self._base_nbytes - others, 0))
+        if _RECOMMENDER_CACHE.get(self.fingerprint) is self:
+            _RECOMMENDER_CACHE.resize(self.fingerprint)
+
+    def calculate_scores(self, user_profile, weights, vectorized=True, with_reason=True):
+        # vectorized=False 时走逐行 apply 的旧实现，用于对比结果一致性 (两条路径返回相同的列)
+        # 只需要得分时可传 with_reason=False 跳过推荐理由；recommend 只为入选行调用 explain
+        if vectorized:
+            df = self._calculate_scores_vectorized(user_profile, weights)
+            return self.explain(df, user_profile) if with_reason else df
+        df = self._calculate_scores_legacy(user_profile, weights)
+        return df if with_reason else df.drop(columns='推荐理由')
+
+    @staticmethod
+    def explain(df, user_profile):
+        # 为已评分的结果 (通常只是展示的那部分) 补充推荐理由列
+        df['推荐理由'] = build_reasons(df, user_profile.get('district', ''))
+        return df
+
+    # ------------------------------------------
+    # 列式评分引擎：预计算特征索引 + 查表 + 加权点积
+    # ------------------------------------------
+    def _calculate_scores_vectorized(self, user_profile, weights):
+        rows, dims, total = self._score(user_profile, weights)
+        df = self._materialize(rows, dims, total)
+        return df.sort_values(by='综合得分', ascending=False, kind='stable')
+
+    def recommend(self, user_profile, weights, threshold=HIGH_SCORE_THRESHOLD, fallback_k=FALLBACK_TOP_N,
+                  progress=None):
+        # 第4步使用的推荐结果：只对入选行排序并生成推荐理由，其余行不落地
+        # 返回副本，调用方可以自由添加列而不污染缓存；progress 接收各阶段进度 (见 report_progress)
+        key = request_key(user_profile, weights, threshold, fallback_k)
+        with stage('recommend', rows_in=len(self.df), cache_hit=key in self._results) as s:
+            df = self._results.get_or_create(
+                key, lambda: self._recommend(user_profile, weights, threshold, fallback_k, progress=progress))
+            s.rows_out = len(df)
+        report_progress(progress, 'done')
+        return df.copy()
+
+    def stats_cube(self, user_profile, weights, threshold=HIGH_SCORE_THRESHOLD, fallback_k=FALLBACK_TOP_N):
+        # 与 recommend 同一批入选岗位的统计立方体 (见 dashboard.StatsCube)；重跑时直接复用，不再扫描结果表
+        key = request_key(user_profile, weights, threshold, fallback_k)
+
+        def build():
+            df = self._results.get_or_create(
+                key, lambda: self._recommend(user_profile, weights, threshold, fallback_k))
+            return StatsCube.from_jobs(df, user_profile.get('preferred_cities', []))
+
+        return self._cubes.get_or_create(key, build)
+
+    def prepare(self, user_profile, progress=None):
+        # 与权重无关的部分 (学历过滤 + 七维得分) 按用户画像缓存；第2步结束后即可在后台预先计算
+        key = request_key(user_profile)
+        return self._dimensions.get_or_create(key, lambda: self._score_dimensions(user_profile, progress))
+
+    def top_k(self, user_profile, weights, k, columns=None):
+        # 按综合得分取前 k 名 (不设阈值，不经过结果缓存)，供批量打分使用；columns 可限定输出的原始列
+        return self._recommend(user_profile, weights, np.inf, k, columns, cache=False)
+
+    def _recommend(self, user_profile, weights, threshold, fallback_k, columns=None, cache=True, progress=None):
+        scorer = None if cache else self._parallel_scorer()
+        if scorer is not None:
+            # 不缓存各维得分时，各分区只回传候选行，合并 Top-K 后在主进程补算这些行的各维得分
+            report_progress(progress, 'score')
+            with stage('parallel', rows_in=len(self.df), workers=scorer.workers) as s:
+                rows, total = scorer.top(user_profile, weights, threshold, fallback_k)
+                s.rows_out = len(rows)
+            with stage('rank', rows_in=len(rows)) as s:
+                user_edu_val = EDU_MAP.get(user_profile['education'], 3)
+                dims = self.features.score_dimensions(rows, user_profile, user_edu_val)
+                df = self._materialize(rows, dims, total, columns)
+                s.rows_out = len(df)
+            with stage('reasons', rows_in=len(df)):
+                return self.explain(df, user_profile)
+        rows, dims, total = self._score(user_profile, weights, cache, progress)
+        report_progress(progress, 'rank')
+        with stage('rank', rows_in=len(total)) as s:
+            picked = rank_top_jobs(total, threshold, fallback_k)
+            df = self._materialize(rows[picked], {col: v[picked] for col, v in dims.items()}, total[picked], columns)
+            s.rows_out = len(df)
+        with stage('reasons', rows_in=len(df)):
+            return self.explain(df, user_profile)
+
+    def _score(self, user_profile, weights, cache=True, progress=None):
+        # 返回 (通过学历过滤的行号, 各维得分, 综合得分)，均为数组
+        if cache:
+            rows, dims = self.prepare(user_profile, progress)
+        else:
+            rows, dims = self._score_dimensions(user_profile, progress)
+        with stage('total', rows_in=len(rows)):
+            return rows, dims, weighted_total(dims, weights)
+
+    def _score_dimensions(self, user_profile, progress=None):
+        features = self.features
+        user_edu_val = EDU_MAP.get(user_profile['education'], 3)
+        scorer = self._parallel_scorer()
+        if scorer is not None:
+            report_progress(progress, 'score')
+            with stage('parallel', rows_in=features.n_rows, workers=scorer.workers) as s:
+                rows, dims, _ = scorer.score(user_profile)
+                s.rows_out = len(rows)
+                return rows, dims
+        report_progress(progress, 'filter')
+        with stage('filter', rows_in=features.n_rows) as s:
+            rows = features.eligible_rows(user_edu_val)
+            s.rows_out = len(rows)
+        report_progress(progress, 'score')
+        with stage('score', rows_in=len(rows)):
+            return rows, features.score_dimensions(rows, user_profile, user_edu_val)
+
+    def _materialize(self, rows, dims, total, columns=None):
+        source = self.df
+        if columns is not None:
+            # 推荐理由需要工作地区
+            source = source[[c for c in source.columns if c in columns or c == '工作地区']]
+        df = source.take(rows)
+        # 分类列只保留结果中出现的类别，便于第4步直接 value_counts / groupby
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = _remove_unused_categories(df[col])
+        scores = {'学历数值': self.features.edu_val[rows]}
+        for col in JobFeatureIndex.DIMENSION_SCORERS:
+            scores[col] = dims[col]
+        scores['综合得分'] = total
+        return pd.concat([df, pd.DataFrame(scores, index=df.index)], axis=1)
+
+    # ------------------------------------------
+    # 旧实现 (逐行 apply)，保留作一致性校验的基准
+    # ------------------------------------------
+    def _calculate_scores_legacy(self, user_profile, weights):
+        df = self.df.copy()
+
+        # --- 🔧 核心修复：学历硬性门槛过滤 ---
+        # 逻辑：如果岗位要求的学历 > 用户的学历，直接剔除，不予推荐。
+        edu_map = EDU_MAP
+        user_edu_val = edu_map.get(user_profile['education'], 3)  # 默认为大专/本科水平
+
+        # 计算每一行的岗位学历值
+        def get_job_edu_val(text):
+            # 提取学历关键词，例如 "本科/硕士" 取 "本科"
+            # 默认给0 (不限)，保证低门槛岗位能通过
+            first_req = str(text).split('/')[0]
+            return edu_map.get(first_req, 0)
+
+        df['学历数值'] = df['学历要求'].apply(get_job_edu_val)
+
+        # 🚨 执行硬过滤：保留 (岗位要求 <= 用户学历) 的岗位
+        # 例如：用户是本科(4)，可以看本科(4)、专科(3)、不限(0)；不能看硕士(5)
+        df = df[df['学历数值'] <= user_edu_val].copy()
+
+        # --- 维度 1: 学历评分 (过滤后剩下的都是合格的，但匹配度不同) ---
+        def score_edu(job_val):
+            # 刚好匹配给100，用户学历远高于岗位给80 (向下兼容)
+            if user_edu_val == job_val: return 100
+            return 85  # 向下兼容，比如本科生去面专科岗，也是有竞争力的
+
+        df['S_学历'] = df['学历数值'].apply(score_edu)
+
+        # --- 维度 2: 经验匹配 ---
+        def score_exp(job_exp):
+            job_exp_str = str(job_exp)
+            if "无" in job_exp_str or "不限" in job_exp_str: return 100
+            if user_profile['experience'] == "应届生":
+                return 100 if "应届" in job_exp_str else 60
+            return 90 if "应届" not in job_exp_str else 70
+
+        df['S_经验'] = df['经验要求'].apply(score_exp)
+
+        # --- 维度 3: 专业与职能契合度 ---
+        target_keywords = JOB_CATEGORY_KEYWORDS.get(user_profile['job_category'], [])
+        preferred_industries = user_profile['preferred_industries']
+
+        def score_professional(row):
+            score = 0
+            title = str(row['职位名称'])
+            industry = str(row['行业'])
+            for kw in target_keywords:
+                if kw in title:
+                    score += 50
+                    break
+            for ind in preferred_industries:
+                if ind[:2] in industry or industry in ind:
+                    score += 30
+                    break
+            if user_profile['major'] in title or user_profile['major'] in industry:
+                score += 20
+            return min(score, 100)
+
+        df['S_专业'] = df.apply(score_professional, axis=1)
+
+        # --- 维度 4: 薪资竞争力 ---
+        min_expect = user_profile['min_salary']
+        df['S_薪资'] = df['平均薪资'].apply(lambda x: min(120, (x / min_expect * 100)) if x >= min_expect * 0.9 else 40)
+
+        # --- 维度 5: 城市与通勤 ---
+        user_cities = user_profile['preferred_cities']
+        user_district = user_profile.get('district', '')
+
+        def score_city_location(row):
+            loc = str(row['工作地区'])
+            score = 40
+            if len(user_cities) > 0 and user_cities[0] in loc:
+                score = 100
+            elif len(user_cities) > 1 and user_cities[1] in loc:
+                score = 90
+            elif len(user_cities) > 2 and user_cities[2] in loc:
+                score = 85
+            elif any(c in loc for c in ['广州', '深圳']):
+                score = 60
+
+            if user_district and user_district in loc:
+                score += 20
+            return min(score, 120)
+
+        df['S_城市'] = df.apply(score_city_location, axis=1)
+
+        # --- 维度 6: 稳定性 ---
+        stable_keywords = STABLE_KEYWORDS
+
+        def score_stability(row):
+            text = str(row['单位名称']) + str(row['单位性质'])
+            for kw in stable_keywords:
+                if kw in text: return 100
+            return 60
+
+        df['S_稳定'] = df.apply(score_stability, axis=1)
+
+        # --- 维度 7: 潜力 ---
+        growth_keywords = GROWTH_KEYWORDS
+
+        def score_growth(text):
+            score = 60
+            for kw in growth_keywords:
+                if kw in str(text): score += 15
+            return min(score, 100)
+
+        df['S_潜力'] = df['职位名称'].apply(score_growth)
+
+        # --- 综合加权 ---
+        df['综合得分'] = (
+                                 df['S_学历'] * weights['学历'] +
+                                 df['S_经验'] * weights['经验'] +
+                                 df['S_专业'] * weights['专业'] +
+                                 df['S_薪资'] * weights['薪资'] +
+                                 df['S_城市'] * weights['城市'] +
+                                 df['S_潜力'] * weights['潜力'] +
+                                 df['S_稳定'] * weights['稳定']
+                         ) / 100
+
+        # --- 生成推荐理由 ---
+        df['推荐理由'] = df.apply(_build_reason, axis=1, args=(user_district,))
+
+        # 返回结果 (只要有分数的都返回，筛选在Step4做)
+        return df.sort_values(by='综合得分', ascending=False, kind='stable')
+
+
+# 已准备好的推荐器 (清洗后的表 + 特征索引)，进程内所有会话共享
+_RECOMMENDER_CACHE = LRUCache(max_entries=RECOMMENDER_CACHE_MAX_DATASETS,
+                              max_bytes=RECOMMENDER_CACHE_MAX_MB * 1024 ** 2,
+                              sizeof=lambda recommender: recommender.nbytes())
+
+
+def recommender_cache():
+    return _RECOMMENDER_CACHE
+
+
+def get_recommender(df, fingerprint=None):
+    fingerprint = fingerprint or dataset_fingerprint(df)
+    return _RECOMMENDER_CACHE.get_or_create(fingerprint, lambda: JobRecommender(df, fingerprint))
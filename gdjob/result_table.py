@@ -0,0 +1,61 @@
+# ==========================================
+# 第4步 详细岗位列表：在服务端对排好序的推荐结果做筛选 / 排序 / 分页，界面只渲染 (并着色) 当前页
+# 筛选与排序只产生行位置数组，不复制结果表；切页只需对一页数据取行
+# ==========================================
+import numpy as np
+import pandas as pd
+
+from .dashboard import display_area, salary_band
+
+TABLE_COLUMNS = [
+    '综合得分', '推荐理由', '职位名称', '单位名称', '薪资文本', '工作地区',
+    '学历要求', '经验要求', '行业', '单位性质', '单位规模', '用工性质',
+    '薪资下限', '薪资上限', '住宿情况', '发布时间', '来源类型', '职位来源', '岗位ID'
+]
+# 可排序的列 (缺省为综合得分降序，即推荐结果本身的顺序)
+SORT_COLUMNS = ['综合得分', '平均薪资', '薪资下限', '薪资上限', '发布时间']
+PAGE_SIZES = [50, 100, 200, 500]
+
+
+def _isin(series, values):
+    # 分类列只比较类别编码，避免逐行比较字符串
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        hit = np.isin(np.asarray(series.cat.categories, dtype=object), np.asarray(list(values), dtype=object))
+        codes = series.cat.codes.to_numpy()
+        return (codes >= 0) & hit[np.maximum(codes, 0)]
+    return series.isin(list(values)).to_numpy()
+
+
+def query_results(top_jobs, industries=None, areas=None, salary_bands=None, user_cities=(), sort_by='综合得分',
+                  ascending=False):
+    # 返回满足条件的行位置 (按排序后的先后)，筛选口径与驾驶舱一致：
+    # areas 为显示区域 (见 smart_location_name)，salary_bands 为薪资段 (见 SALARY_LABELS)；同值保持推荐结果中的原顺序
+    mask = np.ones(len(top_jobs), dtype=bool)
+    if industries:
+        mask &= _isin(top_jobs['行业'], industries)
+    if areas:
+        mask &= _isin(display_area(top_jobs, user_cities), areas)
+    if salary_bands:
+        mask &= _isin(salary_band(top_jobs), salary_bands)
+    positions = np.flatnonzero(mask)
+
+    if sort_by == '综合得分' and not ascending:
+        return positions
+    values = top_jobs[sort_by].iloc[positions].reset_index(drop=True)
+    order = values.sort_values(ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+    return positions[order]
+
+
+def page_count(n_rows, page_size):
+    return max((n_rows + page_size - 1) // page_size, 1)
+
+
+def result_page(top_jobs, positions, page, page_size):
+    # 第 page 页 (从 1 开始) 的展示列；岗位ID 等展示格式只对当前页处理
+    page = min(max(page, 1), page_count(len(positions), page_size))
+    rows = positions[(page - 1) * page_size:page * page_size]
+    columns = [c for c in TABLE_COLUMNS if c in top_jobs.columns]
+    df = top_jobs[columns].iloc[rows].copy()
+    if '岗位ID' in df.columns:
+        df['岗位ID'] = df['岗位ID'].astype(str).str.replace('.0', '', regex=False)
+    return df
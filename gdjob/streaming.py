@@ -0,0 +1,109 @@
+# ==========================================
+# 流式推荐：超大 CSV 分块读取 → 清洗 → 学历过滤 → 评分，只保留有界的 Top-K 与驾驶舱统计
+# 峰值内存只取决于分块行数与结果上限，与文件总行数无关
+# ==========================================
+import contextlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from .constants import EDU_MAP, FALLBACK_TOP_N, HIGH_SCORE_THRESHOLD
+from .dashboard import StatsCube, annotate_jobs, summarize_jobs
+from .profiling import stage
+from .recommender import JobFeatureIndex, build_reasons, clean_job_table, rank_top_jobs, weighted_total
+
+STREAM_CHUNK_ROWS = int(os.environ.get('GDJOB_STREAM_CHUNK_ROWS', 200_000))
+# 高分岗位超过该数量时只保留得分最高的部分 (统计仍覆盖全部高分岗位)
+STREAM_MAX_RESULTS = int(os.environ.get('GDJOB_STREAM_MAX_RESULTS', 5_000))
+
+
+@contextlib.contextmanager
+def _open_csv(source):
+    # 返回 (文件对象, 总字节数)；支持本地路径与 Streamlit 上传文件等可 seek 的文件对象
+    if hasattr(source, 'read'):
+        source.seek(0, os.SEEK_END)
+        size = source.tell()
+        source.seek(0)
+        yield source, size
+        return
+    with open(source, 'rb') as f:
+        yield f, os.path.getsize(source)
+
+
+def _scored_rows(df, rows, edu_val, dims, total, offset):
+    # 与 JobRecommender._materialize 相同的列布局；分类列转回普通列，便于跨分块拼接
+    part = df.take(rows)
+    for col in part.columns:
+        if isinstance(part[col].dtype, pd.CategoricalDtype):
+            part[col] = part[col].astype(object)
+    scores = {'学历数值': edu_val, **dims, '综合得分': total}
+    part = pd.concat([part, pd.DataFrame(scores, index=part.index)], axis=1)
+    part.index = rows + offset
+    return part
+
+
+def _merge_top(kept, part, k):
+    # 合并后按 (得分降序, 行号升序) 取前 k 名，等价于全量稳定排序后截取
+    merged = part if kept is None else pd.concat([kept, part])
+    order = np.lexsort((merged.index.to_numpy(), -merged['综合得分'].to_numpy()))
+    return merged.take(order[:k])
+
+
+def stream_recommend(source, user_profile, weights, threshold=HIGH_SCORE_THRESHOLD, fallback_k=FALLBACK_TOP_N,
+                     max_results=STREAM_MAX_RESULTS, chunk_rows=STREAM_CHUNK_ROWS, progress=None):
+    # 返回 dict：top_jobs (结果表，同 recommend)、summary (同 summarize_jobs)、n_rows / n_eligible / n_selected、
+    # truncated (高分岗位多于 max_results 时为 True，top_jobs 只含得分最高的 max_results 个)
+    user_edu_val = EDU_MAP.get(user_profile['education'], 3)
+    user_cities = user_profile.get('preferred_cities', [])
+    totals = StatsCube(user_cities)
+    keep = max(max_results, fallback_k)
+    kept = None
+    n_rows = n_eligible = n_high = 0
+
+    with _open_csv(source) as (handle, size), stage('stream') as s:
+        for chunk in pd.read_csv(handle, chunksize=chunk_rows):
+            with stage('chunk', rows_in=len(chunk)) as chunk_stage:
+                df = clean_job_table(chunk)
+                features = JobFeatureIndex(df)
+                rows = features.eligible_rows(user_edu_val)
+                dims = features.score_dimensions(rows, user_profile, user_edu_val)
+                total = weighted_total(dims, weights)
+
+                high = total >= threshold
+                if high.any():
+                    n_high += int(high.sum())
+                    totals.add(df[['工作地区', '行业', '平均薪资']].take(rows[high]))
+                picked = rank_top_jobs(total, np.inf, keep)
+                part = _scored_rows(df, rows[picked], features.edu_val[rows[picked]],
+                                    {col: v[picked] for col, v in dims.items()}, total[picked], n_rows)
+                kept = _merge_top(kept, part, keep)
+                chunk_stage.rows_out = len(picked)
+            n_rows += len(chunk)
+            n_eligible += len(rows)
+            if progress is not None:
+                progress('score', min(handle.tell() / max(size, 1), 1.0) * 0.9, f"🧮 流式评分中：已处理 {n_rows:,} 行")
+        s.rows_out = n_high
+
+    if kept is None:
+        raise ValueError("岗位文件为空")
+    if progress is not None:
+        progress('rank', 0.95, "🏆 正在整理推荐结果...")
+    if n_high:
+        top_jobs = kept[kept['综合得分'] >= threshold].copy()
+    else:
+        top_jobs = kept.head(fallback_k).copy()
+    top_jobs['推荐理由'] = build_reasons(top_jobs, user_profile.get('district', ''))
+    if n_high:
+        summary = totals.summary()
+        annotate_jobs(top_jobs, user_cities)
+    else:
+        summary = summarize_jobs(top_jobs, user_cities)
+    return {
+        'top_jobs': top_jobs,
+        'summary': summary,
+        'n_rows': n_rows,
+        'n_eligible': n_eligible,
+        'n_selected': n_high or len(top_jobs),
+        'truncated': n_high > len(top_jobs),
+    }
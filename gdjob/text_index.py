@@ -0,0 +1,102 @@
+# ==========================================
+# 字符 n-gram 倒排索引：按数据集构建一次，关键词/专业的子串匹配变为 postings 求交
+# ==========================================
+import numpy as np
+import pandas as pd
+
+_EMPTY = np.zeros(0, dtype=np.int32)
+# 建索引时每块处理的取值个数 (按长度排序后分块，块内补齐到同一宽度)
+_BLOCK_SIZE = 65536
+
+
+class NgramIndex:
+    # 对去重后的取值 (职位名称/行业/单位名称等) 建单字 + 双字 postings，postings 为取值编号的有序数组 (CSR 存储)
+    # contains(text) 与 `text in value` 逐值判断结果一致：
+    #   - 单字直接取 postings；多字取其所有双字 postings 的交集，再只对候选核对一次 (双字都命中不代表连续出现)
+    #   - 查询代价取决于最短的 postings，而不是取值总数
+    def __init__(self, values):
+        self.values = pd.Series([str(v) for v in values], dtype=object)
+        self.n_values = len(self.values)
+        self._values = self.values.to_numpy()
+
+        # 单字/双字编码为整数键：单字为码位，双字为 (前一码位 << 21 | 后一码位)，两者取值范围不重叠
+        # 按长度分块转成定长码位矩阵后整体向量化处理，避免逐字符的 Python 循环
+        keys, ids = [], []
+        order = np.argsort(self.values.str.len().to_numpy(), kind='stable') if self.n_values else _EMPTY
+        for start in range(0, self.n_values, _BLOCK_SIZE):
+            block = order[start:start + _BLOCK_SIZE]
+            chars = np.array(self._values[block].tolist(), dtype=str)
+            width = chars.dtype.itemsize // 4
+            if width == 0:
+                continue
+            codes = chars.view(np.uint32).reshape(len(block), width).astype(np.int64)
+            rows = np.broadcast_to(block[:, None].astype(np.int32), codes.shape)
+            valid = codes > 0
+            keys.append(codes[valid])
+            ids.append(rows[valid])
+            pair_valid = valid[:, 1:]
+            keys.append(((codes[:, :-1] << 21) | codes[:, 1:])[pair_valid])
+            ids.append(rows[:, 1:][pair_valid])
+        keys = np.concatenate(keys) if keys else np.zeros(0, dtype=np.int64)
+        ids = np.concatenate(ids) if ids else _EMPTY
+
+        # 按 (键, 取值编号) 排序去重，得到 CSR：第 k 个键的 postings 为 ids[offsets[k]:offsets[k+1]]
+        order = np.lexsort((ids, keys))
+        keys, ids = keys[order], ids[order]
+        keep = np.ones(len(ids), dtype=bool)
+        keep[1:] = (keys[1:] != keys[:-1]) | (ids[1:] != ids[:-1])
+        keys, self._ids = keys[keep], ids[keep]
+        self._keys, starts = np.unique(keys, return_index=True)
+        self._offsets = np.append(starts, len(keys)).astype(np.int64)
+
+    def nbytes(self):
+        return self._ids.nbytes + self._keys.nbytes + self._offsets.nbytes
+
+    @staticmethod
+    def _gram_key(gram):
+        if len(gram) == 1:
+            return ord(gram)
+        return (ord(gram[0]) << 21) | ord(gram[1])
+
+    def postings(self, gram):
+        key = self._gram_key(gram)
+        slot = np.searchsorted(self._keys, key)
+        if slot == len(self._keys) or self._keys[slot] != key:
+            return _EMPTY
+        return self._ids[self._offsets[slot]:self._offsets[slot + 1]]
+
+    def lookup(self, text):
+        # 包含 text 的取值编号 (有序)；空串视为全部命中
+        if not text:
+            return np.arange(self.n_values, dtype=np.int32)
+        if len(text) == 1:
+            return self.postings(text)
+        lists = sorted((self.postings(text[i:i + 2]) for i in range(len(text) - 1)), key=len)
+        candidates = lists[0]
+        for ids in lists[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, ids, assume_unique=True)
+        if len(text) > 2 and len(candidates):
+            candidates = candidates[np.fromiter((text in v for v in self._values[candidates]), dtype=bool,
+                                                count=len(candidates))]
+        return candidates
+
+    def contains(self, text):
+        # 逐取值的布尔掩码，可直接按字典编码展开到行
+        mask = np.zeros(self.n_values, dtype=bool)
+        mask[self.lookup(text)] = True
+        return mask
+
+    def contains_any(self, keywords):
+        mask = np.zeros(self.n_values, dtype=bool)
+        for kw in keywords:
+            mask[self.lookup(kw)] = True
+        return mask
+
+    def count_any(self, keywords):
+        # 每个取值命中的关键词个数
+        counts = np.zeros(self.n_values, dtype=np.int8)
+        for kw in keywords:
+            counts[self.lookup(kw)] += 1
+        return counts
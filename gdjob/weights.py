@@ -0,0 +1,26 @@
+# ==========================================
+# 第3步价值观问卷 → 各维度评分权重
+# ==========================================
+
+
+def derive_weights(q1, q2):
+    # q1: 最看重什么 (薪资/成长/稳定)；q2: 对专业对口的执念 0-100
+    weights = {'学历': 10, '经验': 10, '专业': 15, '薪资': 20, '城市': 25, '潜力': 15, '稳定': 5}
+    if "薪资" in q1:
+        weights['薪资'] += 20
+        weights['城市'] -= 10
+        weights['稳定'] -= 5
+        weights['潜力'] -= 5
+    elif "成长" in q1:
+        weights['潜力'] += 20
+        weights['薪资'] -= 5
+        weights['稳定'] -= 5
+        weights['学历'] -= 10
+    elif "稳定" in q1:
+        weights['城市'] += 10
+        weights['稳定'] += 20
+        weights['薪资'] -= 10
+        weights['潜力'] -= 10
+        weights['经验'] -= 10
+    weights['专业'] = int(10 + (q2 / 100 * 15))
+    return weights
@@ -1,221 +1,48 @@
-import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
-import re
+import os
 import time
 
-# ==========================================
-# 0. 配置与工具函数
-# ==========================================
-st.set_page_config(page_title="广东省岗位智能推荐系统 Pro", layout="wide", page_icon="💼")
-
-# 预定义的分类关键词映射库
-JOB_CATEGORY_KEYWORDS = {
-    "事务/职能类 (行政、人事、助理)": ["行政", "人事", "HR", "助理", "文员", "秘书", "前台", "专员", "后勤", "档案"],
-    "沟通/销售类 (销售、咨询、客服)": ["销售", "顾问", "业务", "客服", "客户", "经理", "招商", "代表", "置业", "经纪人"],
-    "技术/研发类 (开发、运维、工程)": ["工程师", "开发", "运维", "数据", "算法", "IT", "测试", "架构", "前端", "后端"],
-    "设计/创意类 (UI、设计、媒体)": ["设计", "UI", "美工", "剪辑", "策划", "文案", "新媒体", "视频", "创意"],
-    "财务/金融类 (会计、审计、风控)": ["会计", "财务", "审计", "出纳", "结算", "风控", "投资", "分析师"],
-    "运营/管理类 (运营、项目、管培)": ["运营", "项目", "管培生", "储备", "主管", "店长", "调度"],
-    "教育/服务类 (教师、培训、服务)": ["教师", "培训", "教务", "服务员", "司机", "保安", "厨师"]
-}
-
-# 常见行业列表
-INDUSTRY_LIST = [
-    "互联网/计算机/软件", "金融/银行/保险", "教育/培训/院校", "房地产/建筑/建材",
-    "批发/零售/贸易", "制造业/机械/电子", "医疗/卫生/制药", "物流/运输/仓储",
-    "广告/传媒/文化", "政府/公共事业/非盈利", "服务业 (餐饮/酒店/旅游)"
-]
-
-# 广东省主要城市列表
-GUANGDONG_CITIES = [
-    "广州市", "深圳市", "珠海市", "佛山市", "东莞市", "惠州市", "中山市",
-    "江门市", "肇庆市", "汕头市", "湛江市", "茂名市", "清远市", "韶关市"
-]
+import streamlit as st
 
+from gdjob import (
+    GUANGDONG_CITIES, INDUSTRY_LIST, JOB_CATEGORY_KEYWORDS, SCORE_DIMENSIONS, StageProfiler, annotate_jobs,
+    derive_weights, file_fingerprint, prefetch, prepare_recommender, stream_recommend,
+)
+from gdjob.dashboard import SALARY_LABELS
+from gdjob.export import EXPORT_FORMATS, available_formats, read_export
+from gdjob.profiling import activate, stage, to_jsonl
+from gdjob.result_table import PAGE_SIZES, SORT_COLUMNS, page_count, query_results, result_page
 
 # ==========================================
-# 1. 核心逻辑层 (已修复学历过滤)
+# 0. 配置 (评分核心、常量与权重推导见 gdjob 包)
 # ==========================================
-
-class JobRecommender:
-    def __init__(self, df):
-        self.df = df.copy()
-        # 数据清洗
-        self.df['薪资下限'] = pd.to_numeric(self.df['薪资下限'], errors='coerce').fillna(0)
-        self.df['薪资上限'] = pd.to_numeric(self.df['薪资上限'], errors='coerce').fillna(0)
-        self.df['平均薪资'] = (self.df['薪资下限'] + self.df['薪资上限']) / 2
-        # 填充缺失值
-        str_cols = ['职位名称', '行业', '工作地区', '单位名称', '单位性质', '学历要求', '经验要求']
-        for col in str_cols:
-            if col in self.df.columns:
-                self.df[col] = self.df[col].fillna('')
-            else:
-                self.df[col] = ''
-
-    def calculate_scores(self, user_profile, weights):
-        df = self.df.copy()
-
-        # --- 🔧 核心修复：学历硬性门槛过滤 ---
-        # 逻辑：如果岗位要求的学历 > 用户的学历，直接剔除，不予推荐。
-        edu_map = {
-            '博士': 6,
-            '硕士研究生': 5, '硕士': 5,
-            '大学本科': 4, '本科': 4,
-            '大学专科': 3, '专科': 3,
-            '中专': 2, '高中': 2, '中技': 2,
-            '初中': 1, '不限': 0, '': 0
-        }
-        user_edu_val = edu_map.get(user_profile['education'], 3)  # 默认为大专/本科水平
-
-        # 计算每一行的岗位学历值
-        def get_job_edu_val(text):
-            # 提取学历关键词，例如 "本科/硕士" 取 "本科"
-            # 默认给0 (不限)，保证低门槛岗位能通过
-            first_req = str(text).split('/')[0]
-            return edu_map.get(first_req, 0)
-
-        df['学历数值'] = df['学历要求'].apply(get_job_edu_val)
-
-        # 🚨 执行硬过滤：保留 (岗位要求 <= 用户学历) 的岗位
-        # 例如：用户是本科(4)，可以看本科(4)、专科(3)、不限(0)；不能看硕士(5)
-        df = df[df['学历数值'] <= user_edu_val].copy()
-
-        # --- 维度 1: 学历评分 (过滤后剩下的都是合格的，但匹配度不同) ---
-        def score_edu(job_val):
-            # 刚好匹配给100，用户学历远高于岗位给80 (向下兼容)
-            if user_edu_val == job_val: return 100
-            return 85  # 向下兼容，比如本科生去面专科岗，也是有竞争力的
-
-        df['S_学历'] = df['学历数值'].apply(score_edu)
-
-        # --- 维度 2: 经验匹配 ---
-        def score_exp(job_exp):
-            job_exp_str = str(job_exp)
-            if "无" in job_exp_str or "不限" in job_exp_str: return 100
-            if user_profile['experience'] == "应届生":
-                return 100 if "应届" in job_exp_str else 60
-            return 90 if "应届" not in job_exp_str else 70
-
-        df['S_经验'] = df['经验要求'].apply(score_exp)
-
-        # --- 维度 3: 专业与职能契合度 ---
-        target_keywords = JOB_CATEGORY_KEYWORDS.get(user_profile['job_category'], [])
-        preferred_industries = user_profile['preferred_industries']
-
-        def score_professional(row):
-            score = 0
-            title = str(row['职位名称'])
-            industry = str(row['行业'])
-            for kw in target_keywords:
-                if kw in title:
-                    score += 50
-                    break
-            for ind in preferred_industries:
-                if ind[:2] in industry or industry in ind:
-                    score += 30
-                    break
-            if user_profile['major'] in title or user_profile['major'] in industry:
-                score += 20
-            return min(score, 100)
-
-        df['S_专业'] = df.apply(score_professional, axis=1)
-
-        # --- 维度 4: 薪资竞争力 ---
-        min_expect = user_profile['min_salary']
-        df['S_薪资'] = df['平均薪资'].apply(lambda x: min(120, (x / min_expect * 100)) if x >= min_expect * 0.9 else 40)
-
-        # --- 维度 5: 城市与通勤 ---
-        user_cities = user_profile['preferred_cities']
-        user_district = user_profile.get('district', '')
-
-        def score_city_location(row):
-            loc = str(row['工作地区'])
-            score = 40
-            if len(user_cities) > 0 and user_cities[0] in loc:
-                score = 100
-            elif len(user_cities) > 1 and user_cities[1] in loc:
-                score = 90
-            elif len(user_cities) > 2 and user_cities[2] in loc:
-                score = 85
-            elif any(c in loc for c in ['广州', '深圳']):
-                score = 60
-
-            if user_district and user_district in loc:
-                score += 20
-            return min(score, 120)
-
-        df['S_城市'] = df.apply(score_city_location, axis=1)
-
-        # --- 维度 6: 稳定性 ---
-        stable_keywords = ['国企', '央企', '事业单位', '机关', '学校', '医院', '银行', '分行', '政府', '公办']
-
-        def score_stability(row):
-            text = str(row['单位名称']) + str(row['单位性质'])
-            for kw in stable_keywords:
-                if kw in text: return 100
-            return 60
-
-        df['S_稳定'] = df.apply(score_stability, axis=1)
-
-        # --- 维度 7: 潜力 ---
-        growth_keywords = ['管培', '储备', '晋升', '培训', '核心', '梯队', '主管']
-
-        def score_growth(text):
-            score = 60
-            for kw in growth_keywords:
-                if kw in str(text): score += 15
-            return min(score, 100)
-
-        df['S_潜力'] = df['职位名称'].apply(score_growth)
-
-        # --- 综合加权 ---
-        df['综合得分'] = (
-                                 df['S_学历'] * weights['学历'] +
-                                 df['S_经验'] * weights['经验'] +
-                                 df['S_专业'] * weights['专业'] +
-                                 df['S_薪资'] * weights['薪资'] +
-                                 df['S_城市'] * weights['城市'] +
-                                 df['S_潜力'] * weights['潜力'] +
-                                 df['S_稳定'] * weights['稳定']
-                         ) / 100
-
-        # --- 生成推荐理由 ---
-        def get_reason(row):
-            tags = []
-            if user_district and user_district in str(row['工作地区']):
-                tags.append(f"🏠 离家近({user_district})")
-            elif row['S_城市'] >= 90:
-                tags.append("📍 城市匹配")
-            if row['S_薪资'] >= 110: tags.append("💰 薪资优厚")
-            if row['S_稳定'] >= 90: tags.append("🛡️ 铁饭碗/稳定")
-            if row['S_潜力'] >= 80: tags.append("📈 发展空间大")
-            if row['S_专业'] >= 80: tags.append("🎯 专业对口")
-            return " | ".join(tags) if tags else "✅ 综合条件匹配"
-
-        df['推荐理由'] = df.apply(get_reason, axis=1)
-
-        # 返回结果 (只要有分数的都返回，筛选在Step4做)
-        return df.sort_values(by='综合得分', ascending=False)
-
+st.set_page_config(page_title="广东省岗位智能推荐系统 Pro", layout="wide", page_icon="💼")
 
 # ==========================================
-# 2. 交互层
+# 1. 交互层
 # ==========================================
 
 if 'step' not in st.session_state: st.session_state.step = 1
 if 'user_data' not in st.session_state: st.session_state.user_data = {}
+if 'profile_log' not in st.session_state: st.session_state.profile_log = []
+
+
+def upload_fingerprint(file):
+    # 上传文件的内容指纹按 file_id 记在会话中，切换标签页 / 拖动滑块等重跑不再对整个文件求哈希
+    file_id = getattr(file, 'file_id', None)
+    cached = st.session_state.get('upload_fingerprint')
+    if file_id is None or cached is None or cached[0] != file_id:
+        cached = (file_id, file_fingerprint(file))
+        st.session_state.upload_fingerprint = cached
+    return cached[1]
 
 
-@st.cache_data
-def load_data(file):
+def load_recommender(file, progress=None):
+    # 读取上传文件并准备推荐器 (按文件内容在进程内共享，重跑不再重复解析)
     if file is not None:
         try:
-            return pd.read_csv(file)
+            return prepare_recommender(file, progress, fingerprint=upload_fingerprint(file))
         except Exception as e:
             st.error(f"文件读取错误: {e}")
-            return pd.DataFrame()
     return None
 
 
@@ -227,10 +54,23 @@ with st.sidebar:
         st.session_state.uploaded_file = uploaded_file
         st.success("数据已就绪")
     st.divider()
+    st.toggle("⚡ 后台预计算", value=True, key='prefetch_enabled',
+              help="第2步完成后即在后台读取数据并计算匹配度，第3步提交后只需加权排序")
+    st.toggle("🌊 流式模式 (超大文件)", value=False, key='stream_enabled',
+              help="分块读取并评分，只保留得分最高的岗位与统计结果，内存占用与文件行数无关；结果页不支持实时微调权重")
+    st.toggle("🛠 性能诊断", value=False, key='profiling_enabled',
+              help="记录每次运行中 读取 → 清洗 → 过滤 → 评分 → 排序 → 统计 → 渲染 各阶段的耗时、行数与内存变化")
     st.info("💡 提示：本系统已升级算法，支持商圈匹配与稳定性识别。")
 
 # --- 进度条 ---
 current_step = st.session_state.step
+
+# 性能诊断：每次脚本运行对应一条运行记录，记录跨运行累积在会话中 (设置 GDJOB_PROFILE_LOG 时同步追加到文件)
+profiler = None
+if st.session_state.profiling_enabled:
+    profiler = StageProfiler(label=f"{time.strftime('%H:%M:%S')} 第{current_step}步",
+                             records=st.session_state.profile_log, log_path=os.environ.get('GDJOB_PROFILE_LOG'))
+activate(profiler)
 st.progress((current_step - 1) / 3)
 
 # ==========================================
@@ -284,11 +124,16 @@ elif current_step == 2:
             st.session_state.user_data.update(
                 {'preferred_cities': selected_cities, 'district': district, 'job_category': job_category,
                  'preferred_industries': selected_industries})
+            # 画像已确定 (权重只影响加权求和)，提前在后台算好七维得分
+            if st.session_state.get('prefetch_enabled') and not st.session_state.get('stream_enabled') \
+                    and st.session_state.get('uploaded_file') is not None:
+                file_obj = st.session_state.uploaded_file
+                prefetch(file_obj, dict(st.session_state.user_data), fingerprint=upload_fingerprint(file_obj))
             st.session_state.step = 3
             st.rerun()
 
 # ==========================================
-# STEP 3: 价值观与权重 (含缓冲动画)
+# STEP 3: 价值观与权重 (含计算进度)
 # ==========================================
 elif current_step == 3:
     st.subheader("⚖️ 第三步：职业价值观微调")
@@ -304,40 +149,43 @@ elif current_step == 3:
         st.rerun()
 
     if col_next.button("🚀 生成智能推荐报告", type="primary"):
-        weights = {'学历': 10, '经验': 10, '专业': 15, '薪资': 20, '城市': 25, '潜力': 15, '稳定': 5}
-        if "薪资" in q1:
-            weights['薪资'] += 20;
-            weights['城市'] -= 10;
-            weights['稳定'] -= 5;
-            weights['潜力'] -= 5
-        elif "成长" in q1:
-            weights['潜力'] += 20;
-            weights['薪资'] -= 5;
-            weights['稳定'] -= 5;
-            weights['学历'] -= 10
-        elif "稳定" in q1:
-            weights['城市'] += 10;
-            weights['稳定'] += 20;
-            weights['薪资'] -= 10;
-            weights['潜力'] -= 10;
-            weights['经验'] -= 10
-        weights['专业'] = int(10 + (q2 / 100 * 15))
-
-        # 缓冲动画
-        placeholder = st.empty()
-        with placeholder.container():
-            st.markdown("### 🤖 AI 正在全力计算中...")
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            status_text.text("🔍 正在解析您的简历画像与偏好...")
-            for i in range(30): time.sleep(0.01); progress_bar.progress(i)
-            status_text.text(f"🏙️ 正在比对 {len(GUANGDONG_CITIES)} 个城市与商圈距离...")
-            for i in range(30, 70): time.sleep(0.01); progress_bar.progress(i)
-            status_text.text("🧮 正在执行严格学历过滤与加权评分...")
-            for i in range(70, 100): time.sleep(0.01); progress_bar.progress(i)
-            time.sleep(0.3)
+        weights = derive_weights(q1, q2)
+
+        # 进度条由真实计算阶段驱动 (读取 → 特征 → 过滤 → 评分 → 排序)，结果缓存后第4步直接展示
+        file_obj = st.session_state.get('uploaded_file')
+        if file_obj is not None:
+            placeholder = st.empty()
+            with placeholder.container():
+                st.markdown("### 🤖 AI 正在全力计算中...")
+                progress_bar = st.progress(0.0)
+                status_text = st.empty()
+
+            def on_progress(stage, fraction, message):
+                progress_bar.progress(fraction)
+                status_text.text(message)
+
+            if st.session_state.get('stream_enabled'):
+                # 流式模式：分块读取并评分，结果 (Top-K + 驾驶舱统计) 直接交给第4步展示
+                st.session_state.stream_result = None
+                try:
+                    st.session_state.stream_result = stream_recommend(
+                        file_obj, st.session_state.user_data, weights, progress=on_progress)
+                except Exception as e:
+                    st.error(f"文件读取错误: {e}")
+            else:
+                recommender = load_recommender(file_obj, on_progress)
+                if recommender is not None:
+                    recommender.recommend(st.session_state.user_data, weights, progress=on_progress)
 
         st.session_state.weights = weights
+        # 问卷推导的权重作为结果页微调的起点
+        st.session_state.base_weights = weights
+        for _, key in SCORE_DIMENSIONS:
+            st.session_state.pop(f'weight_{key}', None)
+        # 新结果的筛选项不同，列表筛选与页码从头开始
+        for key in ('table_industries', 'table_areas', 'table_bands', 'table_page'):
+            st.session_state.pop(key, None)
+        st.session_state.celebrate = True
         st.session_state.step = 4
         st.rerun()
 
@@ -345,50 +193,74 @@ elif current_step == 3:
 # STEP 4: 结果展示 (Tab分层 + 行业薪资透视)
 # ==========================================
 elif current_step == 4:
-    st.balloons()
-
-    # --- 数据加载 ---
-    file_obj = st.session_state.get('uploaded_file')
-    df = load_data(file_obj)
+    # 图表库只在结果页用到，按需导入
+    import plotly.graph_objects as go
 
-    if df is None or df.empty:
-        st.warning("⚠️ 未检测到上传文件，请在侧边栏重新上传 CSV 文件。")
-        st.stop()
+    # 只在刚生成报告时庆祝一次，结果页内的交互重跑不再重复
+    if st.session_state.pop('celebrate', False):
+        st.balloons()
 
-    recommender = JobRecommender(df)
-    results = recommender.calculate_scores(st.session_state.user_data, st.session_state.weights)
-
-    # 筛选逻辑
-    high_score_jobs = results[results['综合得分'] >= 80]
-    top_jobs = high_score_jobs if not high_score_jobs.empty else results.head(20)
-    top_jobs = top_jobs.sort_values(by='综合得分', ascending=False)
-
-
-    # --- 0. 智能地址清洗逻辑 ---
-    def smart_location_name(loc_str):
-        loc_str = str(loc_str).replace("广东省", "")
-        user_cities = st.session_state.user_data.get('preferred_cities', [])
-        for city in user_cities:
-            if city in loc_str:
-                loc_str = loc_str.replace(city, "")
-        return loc_str if loc_str.strip() else "市辖区/全城"
+    # --- 数据加载 ---
+    if st.session_state.get('stream_enabled'):
+        # 流式模式：第3步已分块算好 Top-K 与全部高分岗位的统计，这里直接展示
+        result = st.session_state.get('stream_result')
+        if result is None:
+            st.warning("⚠️ 未找到流式计算结果，请返回第三步重新生成报告。")
+            st.stop()
+        top_jobs = result['top_jobs'].copy()
+        summary = result['summary']
+        n_selected = result['n_selected']
+        if result['truncated']:
+            st.info(f"🌊 流式模式：共 {n_selected:,} 个高分岗位，列表保留得分最高的 {len(top_jobs):,} 个，"
+                    f"统计图覆盖全部高分岗位。")
+    else:
+        # 推荐器按上传文件内容共享，切换标签页/点击下载等重跑不再重新准备数据
+        recommender = load_recommender(st.session_state.get('uploaded_file'))
+
+        if recommender is None or recommender.df.empty:
+            st.warning("⚠️ 未检测到上传文件，请在侧边栏重新上传 CSV 文件。")
+            st.stop()
+
+        # --- 权重微调：七维得分按用户画像缓存，拖动滑块只需重新加权与排序 ---
+        base_weights = st.session_state.get('base_weights', st.session_state.weights)
+        for _, key in SCORE_DIMENSIONS:
+            if f'weight_{key}' not in st.session_state:
+                st.session_state[f'weight_{key}'] = st.session_state.weights[key]
+
+        def restore_weights():
+            for _, dim in SCORE_DIMENSIONS:
+                st.session_state[f'weight_{dim}'] = base_weights[dim]
+
+        with st.expander("⚖️ 微调权重 (实时重排，无需重新计算匹配度)"):
+            slider_cols = st.columns(len(SCORE_DIMENSIONS))
+            for slider_col, (_, key) in zip(slider_cols, SCORE_DIMENSIONS):
+                slider_col.slider(key, 0, 60, step=1, key=f'weight_{key}')
+            weights = {key: st.session_state[f'weight_{key}'] for _, key in SCORE_DIMENSIONS}
+            col_sum, col_restore = st.columns([4, 1])
+            col_sum.caption(f"权重合计 {sum(weights.values())}，综合得分 = Σ(维度得分 × 权重) / 100")
+            col_restore.button("↩️ 恢复问卷权重", on_click=restore_weights)
+        st.session_state.weights = weights
 
+        # 筛选逻辑：高分岗位全部入选，没有则取前20名 (Top-K 选择，无需全量排序)
+        top_jobs = recommender.recommend(st.session_state.user_data, weights)
 
-    top_jobs['显示区域'] = top_jobs['工作地区'].apply(smart_location_name)
+        # --- 0. 统计口径 (智能地址清洗、薪资段等见 gdjob.dashboard)：预聚合立方体随结果缓存，重跑不再扫描结果表 ---
+        summary = recommender.stats_cube(st.session_state.user_data, weights).summary()
+        n_selected = len(top_jobs)
 
     # --- 1. 宏观统计看板 (始终显示) ---
     st.subheader("📊 岗位透视驾驶舱")
 
-    avg_salary = top_jobs['平均薪资'].mean()
-    top_area_count = top_jobs['显示区域'].value_counts()
+    avg_salary = summary['avg_salary']
+    top_area_count = summary['area_counts']
     top_area_name = top_area_count.idxmax()
-    top_industry_count = top_jobs['行业'].value_counts()
+    top_industry_count = summary['industry_counts']
     top_industry_name = top_industry_count.idxmax() if not top_industry_count.empty else "通用"
 
     m1, m2, m3, m4 = st.columns(4)
-    m1.metric("精选岗位数", f"{len(top_jobs)} 个", "综合评分Top序列")
+    m1.metric("精选岗位数", f"{n_selected} 个", "综合评分Top序列")
     m2.metric("平均月薪", f"{avg_salary / 1000:.1f} k", help="基于筛选出的岗位平均值")
-    m3.metric("热点区域", top_area_name, f"该区占比 {top_area_count.max() / len(top_jobs):.0%}")
+    m3.metric("热点区域", top_area_name, f"该区占比 {top_area_count.max() / n_selected:.0%}")
     m4.metric("核心行业", top_industry_name, "占比最高的主流行业")
 
     st.markdown("---")
@@ -397,13 +269,13 @@ elif current_step == 4:
     tab_charts, tab_list = st.tabs(["📈 全局透视分析 (决策辅助)", "📋 详细岗位列表 (投递清单)"])
 
     # === TAB 1: 图表分析 ===
-    with tab_charts:
+    with tab_charts, stage('render_charts', rows_in=len(top_jobs)):
         # 第一行：区域分布 & 薪资分布
         c1, c2 = st.columns(2)
 
         with c1:
             st.markdown("##### 📍 机会都在哪里？ (区域分布)")
-            area_df = top_jobs['显示区域'].value_counts().head(8).sort_values(ascending=True)
+            area_df = summary['area_counts'].head(8).sort_values(ascending=True)
             fig_area = go.Figure(go.Bar(
                 y=area_df.index, x=area_df.values, orientation='h',
                 text=area_df.values, textposition='auto', marker_color='#4F81BD'
@@ -414,10 +286,7 @@ elif current_step == 4:
 
         with c2:
             st.markdown("##### 💰 整体薪资段位分布")
-            salary_bins = [0, 5000, 8000, 12000, 20000, 100000]
-            salary_labels = ['5k以下', '5k-8k', '8k-12k', '12k-20k', '20k以上']
-            top_jobs['薪资段'] = pd.cut(top_jobs['平均薪资'], bins=salary_bins, labels=salary_labels)
-            sal_counts = top_jobs['薪资段'].value_counts().sort_index()
+            sal_counts = summary['salary_counts']
 
             fig_sal = go.Figure(go.Bar(
                 x=sal_counts.index, y=sal_counts.values,
@@ -435,7 +304,7 @@ elif current_step == 4:
         with c3:
             st.markdown("##### 🏭 都是哪些行业的岗位？ (Top 8)")
             # 行业饼图
-            ind_counts = top_jobs['行业'].value_counts().head(8)
+            ind_counts = summary['industry_counts'].head(8)
             fig_pie = go.Figure(data=[go.Pie(
                 labels=ind_counts.index, values=ind_counts.values, hole=.4, textinfo='label+percent'
             )])
@@ -445,7 +314,7 @@ elif current_step == 4:
         with c4:
             st.markdown("##### 💵 各行业平均薪资对比 (Top 8)")
             # 计算各行业平均薪资
-            ind_salary = top_jobs.groupby('行业')['平均薪资'].mean().sort_values(ascending=True).tail(8)
+            ind_salary = summary['industry_salary'].sort_values(ascending=True).tail(8)
 
             fig_ind_sal = go.Figure(go.Bar(
                 y=ind_salary.index, x=ind_salary.values, orientation='h',
@@ -459,27 +328,46 @@ elif current_step == 4:
             st.plotly_chart(fig_ind_sal, use_container_width=True)
 
     # === TAB 2: 详细列表 ===
-    with tab_list:
-        st.markdown(f"### 📋 推荐清单详情 (共 {len(top_jobs)} 条)")
-
-        full_columns = [
-            '综合得分', '推荐理由', '职位名称', '单位名称', '薪资文本', '工作地区',
-            '学历要求', '经验要求', '行业', '单位性质', '单位规模', '用工性质',
-            '薪资下限', '薪资上限', '住宿情况', '发布时间', '来源类型', '职位来源', '岗位ID'
-        ]
-        valid_cols = [c for c in full_columns if c in top_jobs.columns]
-        display_df = top_jobs[valid_cols].copy()
-
-        if '岗位ID' in display_df.columns:
-            display_df['岗位ID'] = display_df['岗位ID'].astype(str).str.replace('.0', '', regex=False)
+    with tab_list, stage('render_table', rows_in=len(top_jobs)):
+        # 筛选 / 排序 / 分页都在服务端完成，只对当前页着色并发送到浏览器，渲染耗时与结果总数无关
+        user_cities = st.session_state.user_data.get('preferred_cities', [])
 
+        def reset_page():
+            st.session_state.table_page = 1
+
+        def with_selected(options, key):
+            # 调整权重后结果变化时，已选中但不在新结果中的取值仍保留在选项里
+            return options + [v for v in st.session_state.get(key, []) if v not in options]
+
+        f1, f2, f3, f4, f5 = st.columns([3, 3, 2, 2, 1])
+        industries = f1.multiselect("行业", with_selected(list(summary['industry_counts'].index), 'table_industries'),
+                                    key='table_industries', on_change=reset_page, placeholder="全部行业")
+        areas = f2.multiselect("区域", with_selected(list(summary['area_counts'].index), 'table_areas'),
+                               key='table_areas', on_change=reset_page, placeholder="全部区域")
+        bands = f3.multiselect("薪资段", SALARY_LABELS, key='table_bands', on_change=reset_page, placeholder="全部薪资")
+        sort_by = f4.selectbox("排序", [c for c in SORT_COLUMNS if c in top_jobs.columns], key='table_sort',
+                               on_change=reset_page)
+        ascending = f5.toggle("升序", key='table_ascending', on_change=reset_page)
+
+        positions = query_results(top_jobs, industries, areas, bands, user_cities, sort_by, ascending)
+        p1, p2, p3 = st.columns([1, 1, 4])
+        page_size = p1.selectbox("每页条数", PAGE_SIZES, key='table_page_size', on_change=reset_page)
+        n_pages = page_count(len(positions), page_size)
+        if st.session_state.get('table_page', 1) > n_pages:
+            st.session_state.table_page = n_pages
+        page = p2.number_input(f"页码 (共 {n_pages} 页)", min_value=1, max_value=n_pages, step=1, key='table_page')
+
+        st.markdown(f"### 📋 推荐清单详情 (共 {len(top_jobs)} 条，筛选后 {len(positions)} 条)")
+        page_df = result_page(top_jobs, positions, page, page_size)
+        # 色阶按全部结果的得分范围计算，翻页时颜色含义不变
+        scores = top_jobs['综合得分']
         st.dataframe(
-            display_df.style
+            page_df.style
             .format({'综合得分': "{:.1f}", '薪资下限': "{:.0f}", '薪资上限': "{:.0f}"}, na_rep="-")
-            .background_gradient(subset=['综合得分'], cmap="Oranges")
+            .background_gradient(subset=['综合得分'], cmap="Oranges", vmin=scores.min(), vmax=scores.max())
             .highlight_null(color='#f0f2f6'),
             use_container_width=True,
-            height=800,
+            height=min(800, 35 * (len(page_df) + 1) + 3),
             column_config={
                 "岗位ID": st.column_config.TextColumn("岗位ID", help="唯一编号"),
                 "薪资文本": st.column_config.TextColumn("原薪资", width="medium"),
@@ -489,17 +377,56 @@ elif current_step == 4:
 
     # --- 底部操作区 ---
     st.divider()
-    col_dl, col_reset = st.columns([1, 4])
+    col_fmt, col_dl, col_reset = st.columns([1, 1, 3])
+
+    # 导出在点击下载时才生成 (分块写入磁盘缓存，同一结果与格式只生成一次)，重跑页面不再序列化整张结果表
+    export_formats = available_formats()
+    export_fmt = col_fmt.selectbox("导出格式", export_formats, format_func=lambda f: EXPORT_FORMATS[f][0],
+                                   label_visibility="collapsed")
+
+    def build_export(jobs=top_jobs, fmt=export_fmt):
+        if '显示区域' not in jobs.columns:
+            jobs = annotate_jobs(jobs.copy(), user_cities)
+        return read_export(jobs, fmt)
 
-    csv = top_jobs.to_csv(index=False).encode('utf-8-sig')
     col_dl.download_button(
-        label="📥 下载完整数据 (Excel/CSV)",
-        data=csv,
-        file_name='岗位推荐结果_全字段.csv',
-        mime='text/csv',
+        label="📥 下载完整数据",
+        data=build_export,
+        file_name='岗位推荐结果_全字段' + EXPORT_FORMATS[export_fmt][1],
+        mime=EXPORT_FORMATS[export_fmt][2],
         type="primary"
     )
 
     if col_reset.button("🔄 重新开始测评"):
         st.session_state.step = 1
         st.rerun()
+
+# ==========================================
+# 性能诊断面板 (侧边栏，开启后在每次运行末尾绘制)
+# ==========================================
+if profiler is not None:
+    with st.sidebar, st.expander("🛠 性能诊断", expanded=True):
+        log = st.session_state.profile_log
+        runs = {}
+        for record in log:
+            runs.setdefault(record['run'], record['label'])
+        if not runs:
+            st.caption("本次运行暂无计算阶段；上传数据并生成推荐后再查看。")
+        else:
+            run_ids = list(runs)[::-1]
+            run = st.selectbox("运行记录", run_ids, format_func=lambda r: runs[r])
+            records = sorted((r for r in log if r['run'] == run), key=lambda r: r['start_ms'])
+            st.dataframe([{
+                '阶段': '　' * r['depth'] + r['stage'] + (' (缓存)' if r.get('cache_hit') else ''),
+                '耗时ms': r['wall_ms'],
+                '输入行': r['rows_in'],
+                '输出行': r['rows_out'],
+                '内存ΔMB': r['mem_delta_mb'],
+            } for r in records], hide_index=True)
+            total_ms = sum(r['wall_ms'] for r in records if r['depth'] == 0)
+            st.caption(f"顶层阶段合计 {total_ms:.0f} ms")
+            st.download_button("📤 导出 JSON Lines", to_jsonl(log).encode('utf-8'),
+                               file_name='gdjob_profile.jsonl', mime='application/x-ndjson')
+            if st.button("清空诊断记录"):
+                log.clear()
+                st.rerun()
@@ -0,0 +1,309 @@
+# ==========================================
+# 推荐 HTTP 服务：不经过 Streamlit 向导，供其他系统按画像获取 Top-K 岗位 (仅依赖标准库 asyncio)
+# 用法：python serve.py jobs.csv --port 8765 [--workers 4] [--watch 5]
+#
+# 接口 (请求与响应均为 JSON)：
+#   POST /recommend  请求体同 batch.py 的画像 (可含 "weights" 覆盖 q1/q2，"top_k" 指定条数)
+#                    返回 {"id", "weights", "results": [{rank, 岗位ID, ..., 综合得分, 推荐理由}], "dataset"}
+#                    字段类型或取值不合法时返回 400 (校验规则见 gdjob.profiles.normalize_profile)
+#   GET  /health     当前数据集指纹、行数、加载时间与进行中的请求数
+#   POST /reload     重新加载岗位文件 (可传 {"jobs": "新路径"}，只允许启动时岗位文件所在目录下的文件)；
+#                    新数据准备好后才切换，期间照常服务；文件无法读取或格式不对时返回 400，继续使用旧数据
+#
+# - 数据集常驻内存，评分在工作池中执行 (1 个工作线程，或 --workers N 个进程)，不阻塞事件循环
+# - 同时到达的相同请求 (画像 + 权重 + 条数) 合并为一次计算
+# - --watch 秒数：定期检查岗位文件，变化时自动热加载；POSIX 下也可发送 SIGHUP 触发
+# ==========================================
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+
+from gdjob import file_fingerprint, normalize_profile, prepare_recommender, request_key, score_profile
+
+DEFAULT_TOP_K = 20
+MAX_TOP_K = 1000
+MAX_BODY_BYTES = 1024 * 1024
+# 空闲连接的保持时间 (秒)
+KEEP_ALIVE_TIMEOUT = 15
+
+# 进程池工作进程内的推荐器 (按数据集指纹初始化；fork 模式下直接命中父进程已准备好的缓存)
+_worker_recommender = None
+
+
+def _init_worker(jobs_path, fingerprint):
+    global _worker_recommender
+    _worker_recommender = prepare_recommender(jobs_path, fingerprint=fingerprint)
+
+
+def _score_in_worker(profile, k):
+    return score_profile(_worker_recommender, profile, k)
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Dataset:
+    # 一份已加载的岗位数据及其专属工作池；热加载时整体替换，旧工作池处理完手头请求后关闭
+    def __init__(self, jobs_path, workers):
+        self.jobs_path = jobs_path
+        stat = os.stat(jobs_path)
+        self.signature = (stat.st_mtime_ns, stat.st_size)
+        self.fingerprint = file_fingerprint(jobs_path)
+        self.recommender = prepare_recommender(jobs_path, fingerprint=self.fingerprint)
+        self.loaded_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+        if workers <= 1:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='gdjob-serve')
+        else:
+            ctx = mp.get_context('fork') if 'fork' in mp.get_all_start_methods() else None
+            self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker,
+                                                initargs=(jobs_path, self.fingerprint))
+        self.in_process = workers <= 1
+
+    def submit(self, loop, profile, k):
+        if self.in_process:
+            return loop.run_in_executor(self.executor, score_profile, self.recommender, profile, k)
+        return loop.run_in_executor(self.executor, _score_in_worker, profile, k)
+
+    def info(self):
+        return {'jobs': self.jobs_path, 'fingerprint': self.fingerprint, 'rows': len(self.recommender.df),
+                'loaded_at': self.loaded_at}
+
+
+class RecommendationService:
+    def __init__(self, jobs_path, workers=1):
+        self.jobs_path = jobs_path
+        # /reload 只能切换到该目录下的文件
+        self.jobs_dir = os.path.dirname(os.path.realpath(jobs_path))
+        self.workers = workers
+        self.dataset = None
+        self.inflight = {}
+        self.stats = {'requests': 0, 'coalesced': 0, 'reloads': 0}
+        self._reload_lock = asyncio.Lock()
+
+    def resolve_jobs_path(self, jobs):
+        # 客户端给出的岗位文件路径：相对路径按 jobs_dir 解析，解析后 (含符号链接) 须仍在 jobs_dir 之内
+        if not isinstance(jobs, str) or not jobs:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "jobs 须为非空字符串")
+        path = os.path.realpath(os.path.join(self.jobs_dir, jobs))
+        if os.path.commonpath([path, self.jobs_dir]) != self.jobs_dir:
+            raise HTTPError(HTTPStatus.FORBIDDEN, f"只能加载 {self.jobs_dir} 下的岗位文件")
+        return path
+
+    async def reload(self, jobs_path=None):
+        # 在后台线程准备新数据集，准备好后再切换；切换前的请求仍由旧数据集完成
+        async with self._reload_lock:
+            loop = asyncio.get_running_loop()
+            path = jobs_path or self.jobs_path
+            dataset = await loop.run_in_executor(None, Dataset, path, self.workers)
+            old, self.dataset, self.jobs_path = self.dataset, dataset, path
+            if old is not None:
+                self.stats['reloads'] += 1
+                loop.run_in_executor(None, old.executor.shutdown)
+            return dataset
+
+    async def recommend(self, body):
+        dataset = self.dataset
+        if dataset is None:
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "数据集尚未加载完成")
+        k = body.pop('top_k', DEFAULT_TOP_K)
+        # bool 是 int 的子类，需单独排除 true/false
+        if not isinstance(k, int) or isinstance(k, bool) or not 0 < k <= MAX_TOP_K:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"top_k 须为 1~{MAX_TOP_K} 的整数")
+        # 画像在提交到工作池之前校验，不合法时直接返回 400
+        try:
+            profile = normalize_profile(body)
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"画像字段有误: {e}")
+        request_id = profile.pop('id', None)
+
+        # 相同的 (数据集, 画像, 权重, 条数) 只计算一次，后到的请求等待同一结果
+        key = (dataset.fingerprint, request_key(profile, k))
+        self.stats['requests'] += 1
+        future = self.inflight.get(key)
+        if future is None:
+            future = dataset.submit(asyncio.get_running_loop(), {**profile, 'id': request_id}, k)
+            self.inflight[key] = future
+            future.add_done_callback(lambda _: self.inflight.pop(key, None))
+        else:
+            self.stats['coalesced'] += 1
+        result = await asyncio.shield(future)
+        return {**result, 'id': request_id, 'dataset': dataset.fingerprint}
+
+    def health(self):
+        return {'status': 'ok' if self.dataset else 'loading',
+                'dataset': self.dataset.info() if self.dataset else None,
+                'inflight': len(self.inflight), **self.stats}
+
+    async def watch(self, interval):
+        # 岗位文件的修改时间或大小变化时热加载
+        while True:
+            await asyncio.sleep(interval)
+            dataset = self.dataset
+            try:
+                stat = os.stat(self.jobs_path)
+            except OSError:
+                continue
+            if dataset is not None and (stat.st_mtime_ns, stat.st_size) != dataset.signature:
+                await self.reload_in_background()
+
+    async def reload_in_background(self):
+        # 文件监视 / SIGHUP 触发的热加载：失败时只记录日志，继续使用旧数据
+        try:
+            await self.reload()
+            print(f"已热加载 {self.jobs_path}", file=sys.stderr)
+        except Exception as e:
+            print(f"热加载失败，继续使用旧数据：{e!r}", file=sys.stderr)
+
+
+# ------------------------------------------
+# 最小 HTTP/1.1 实现 (支持 keep-alive，请求体只按 Content-Length 读取)
+# 不支持 Transfer-Encoding (分块请求体等)：直接返回 501 并关闭连接，避免剩余字节被当作下一个请求解析
+# ------------------------------------------
+async def _read_request(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, target, version = lines[0].split(' ', 2)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "请求行格式错误")
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            name = name.strip().lower()
+            if name in headers and name in ('content-length', 'transfer-encoding'):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"重复的 {name} 头")
+            headers[name] = value.strip()
+    if 'transfer-encoding' in headers:
+        raise HTTPError(HTTPStatus.NOT_IMPLEMENTED, "不支持 Transfer-Encoding，请使用 Content-Length 发送请求体")
+    length = headers.get('content-length', '0')
+    if not length.isdigit():
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Content-Length 格式错误")
+    length = int(length)
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "请求体过大")
+    body = await reader.readexactly(length) if length else b''
+    keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+    return method, target.split('?', 1)[0], body, keep_alive
+
+
+def _response(status, payload, keep_alive):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+
+def _json_body(body):
+    if not body:
+        return {}
+    try:
+        data = json.loads(body)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "请求体不是合法的 JSON")
+    if not isinstance(data, dict):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "请求体须为 JSON 对象")
+    return data
+
+
+async def _dispatch(service, method, path, body):
+    if path == '/recommend':
+        if method != 'POST':
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "请使用 POST")
+        return await service.recommend(_json_body(body))
+    if path == '/health':
+        return service.health()
+    if path == '/reload':
+        if method != 'POST':
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "请使用 POST")
+        data = _json_body(body)
+        jobs_path = service.resolve_jobs_path(data['jobs']) if 'jobs' in data else None
+        try:
+            dataset = await service.reload(jobs_path)
+        except OSError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"无法读取岗位文件: {e}")
+        except (KeyError, ValueError) as e:
+            # 缺少必需列 (KeyError)、CSV 解析失败 (ParserError / EmptyDataError)、编码错误 (UnicodeDecodeError) 等
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"岗位文件格式有误: {e!r}")
+        return {'status': 'reloaded', 'dataset': dataset.info()}
+    raise HTTPError(HTTPStatus.NOT_FOUND, f"未知路径 {path}")
+
+
+async def handle_connection(service, reader, writer):
+    keep_alive = True
+    try:
+        while keep_alive:
+            try:
+                request = await asyncio.wait_for(_read_request(reader), KEEP_ALIVE_TIMEOUT)
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                break
+            except (asyncio.LimitOverrunError, ValueError):
+                request = None
+            except HTTPError as e:
+                writer.write(_response(e.status, {'error': e.message}, False))
+                break
+            if request is None:
+                writer.write(_response(HTTPStatus.BAD_REQUEST, {'error': "请求头格式错误"}, False))
+                break
+            method, path, body, keep_alive = request
+            try:
+                status, payload = HTTPStatus.OK, await _dispatch(service, method, path, body)
+            except HTTPError as e:
+                status, payload = e.status, {'error': e.message}
+            except Exception as e:
+                status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': repr(e)}
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+async def serve(jobs_path, host, port, workers=1, watch=None):
+    service = RecommendationService(jobs_path, workers)
+    start = time.perf_counter()
+    dataset = await service.reload()
+    print(f"已加载 {dataset.info()['rows']:,} 行岗位 ({time.perf_counter() - start:.1f}s)", file=sys.stderr)
+
+    loop = asyncio.get_running_loop()
+    if hasattr(signal, 'SIGHUP'):
+        loop.add_signal_handler(signal.SIGHUP, lambda: asyncio.ensure_future(service.reload_in_background()))
+    if watch:
+        asyncio.ensure_future(service.watch(watch))
+
+    server = await asyncio.start_server(lambda r, w: handle_connection(service, r, w), host, port)
+    print(f"推荐服务已启动：http://{host}:{port}  (工作{'进程' if workers > 1 else '线程'} {workers} 个)",
+          file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="岗位推荐 HTTP 服务")
+    parser.add_argument('jobs', help="岗位 CSV 文件")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=1, help="评分工作进程数；1 表示在服务进程内用单个工作线程")
+    parser.add_argument('--watch', type=float, default=None, help="每隔多少秒检查岗位文件，变化时自动热加载")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.jobs, args.host, args.port, args.workers, args.watch))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())